@@ -1,29 +1,59 @@
-from Cryptodome.Cipher import AES
 from Cryptodome.Random import get_random_bytes
-from Cryptodome.Protocol.KDF import PBKDF2
 from Cryptodome.Hash import SHA256, HMAC
+from cryptography.hazmat.primitives import hashes
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import os
 import base64
+from functools import lru_cache
+import cryptography
+from cryptography.hazmat.backends import default_backend
 
 # -----------------------------
 # Utility Functions
 # -----------------------------
 def save_ciphertext(file_path, nonce, ciphertext):
-    """Save nonce + ciphertext to a file"""
+    """Save nonce + ciphertext to a file (written separately, no concat copy)"""
     with open(file_path, 'wb') as f:
-        f.write(nonce + ciphertext)
+        f.write(nonce)
+        f.write(ciphertext)
 
 def load_ciphertext(file_path, nonce_length=8):
-    """Load nonce + ciphertext from a file"""
+    """
+    Load nonce + ciphertext from a file
+    The file is read once into a preallocated buffer; ciphertext is returned
+    as a memoryview into it rather than a sliced copy
+    """
+    data = bytearray(os.path.getsize(file_path))
     with open(file_path, 'rb') as f:
-        data = f.read()
-    nonce = data[:nonce_length]
-    ciphertext = data[nonce_length:]
+        f.readinto(data)
+    view = memoryview(data)
+    nonce = bytes(view[:nonce_length])
+    ciphertext = view[nonce_length:]
     return nonce, ciphertext
 
+def aes_backend_banner():
+    """
+    One-line description of the AES backend in use
+    CTR and GCM both run on OpenSSL EVP through the `cryptography` package,
+    which selects AES-NI (or its assembly fallbacks) itself at runtime
+    """
+    return (f"[AES] cryptography {cryptography.__version__} on "
+            f"{default_backend().openssl_version_text()}")
+
 # -----------------------------
 # AES-CTR Encryption
 # -----------------------------
+def _ctr_cipher(key, nonce):
+    """
+    AES-CTR cipher on OpenSSL (EVP, AES-NI when available)
+    Counter block is the 8-byte nonce followed by a 64-bit big-endian
+    counter from 0, the same layout PyCryptodome uses for MODE_CTR
+    """
+    return Cipher(algorithms.AES(key), modes.CTR(nonce.ljust(16, b'\0')))
+
 def aes_ctr_encrypt(data, key_size=32):
     """
     Encrypts data using AES-CTR
@@ -32,10 +62,30 @@ def aes_ctr_encrypt(data, key_size=32):
     """
     key = get_random_bytes(key_size)      # AES key
     nonce = get_random_bytes(8)           # CTR nonce
-    cipher = AES.new(key, AES.MODE_CTR, nonce=nonce)
-    ciphertext = cipher.encrypt(data)
+    encryptor = _ctr_cipher(key, nonce).encryptor()
+    ciphertext = encryptor.update(data) + encryptor.finalize()
     return key, nonce, ciphertext
 
+def aes_ctr_encrypt_payload(data, key_size=32):
+    """
+    Encrypts data using AES-CTR directly into a nonce-prefixed buffer
+    (the nonce + ciphertext layout that gets embedded), so no separate
+    ciphertext object is allocated and then copied behind the nonce
+    Returns: key, bytearray payload
+    """
+    key = get_random_bytes(key_size)
+    nonce = get_random_bytes(8)
+    encryptor = _ctr_cipher(key, nonce).encryptor()
+    
+    # update_into needs block_size - 1 bytes of slack past the output
+    payload = bytearray(len(nonce) + len(data) + 15)
+    payload[:len(nonce)] = nonce
+    with memoryview(payload) as view:
+        written = encryptor.update_into(data, view[len(nonce):])
+    encryptor.finalize()
+    del payload[len(nonce) + written:]
+    return key, payload
+
 # -----------------------------
 # AES-CTR Decryption
 # -----------------------------
@@ -43,13 +93,50 @@ def aes_ctr_decrypt(ciphertext, key, nonce):
     """
     Decrypts AES-CTR ciphertext
     """
-    cipher = AES.new(key, AES.MODE_CTR, nonce=nonce)
-    plaintext = cipher.decrypt(ciphertext)
+    decryptor = _ctr_cipher(key, nonce).decryptor()
+    plaintext = decryptor.update(ciphertext) + decryptor.finalize()
     return plaintext
 
+# -----------------------------
+# AES-CTR File Encryption (streaming)
+# -----------------------------
+def aes_ctr_encrypt_file(in_path, out_path, key=None, key_size=32, chunk_size=1 << 20):
+    """
+    Encrypts a file with AES-CTR, streaming it in chunk_size pieces
+    so memory use stays constant regardless of file size
+    Output layout matches save_ciphertext: nonce + ciphertext
+    Returns: key (generated if not given)
+    """
+    if key is None:
+        key = get_random_bytes(key_size)
+    nonce = get_random_bytes(8)
+    encryptor = _ctr_cipher(key, nonce).encryptor()
+    
+    with open(in_path, 'rb') as f_in, open(out_path, 'wb') as f_out:
+        f_out.write(nonce)
+        while chunk := f_in.read(chunk_size):
+            f_out.write(encryptor.update(chunk))
+        f_out.write(encryptor.finalize())
+    return key
+
+def aes_ctr_decrypt_file(in_path, out_path, key, nonce_length=8, chunk_size=1 << 20):
+    """
+    Decrypts a file written by aes_ctr_encrypt_file (nonce + ciphertext),
+    streaming it in chunk_size pieces
+    """
+    with open(in_path, 'rb') as f_in, open(out_path, 'wb') as f_out:
+        nonce = f_in.read(nonce_length)
+        decryptor = _ctr_cipher(key, nonce).decryptor()
+        while chunk := f_in.read(chunk_size):
+            f_out.write(decryptor.update(chunk))
+        f_out.write(decryptor.finalize())
+
 # -----------------------------
 # Password-based Key Derivation
 # -----------------------------
+# The salt is fixed, so the same password always derives the same key;
+# caching it skips 100k PBKDF2 iterations on every repeat encrypt/decrypt
+@lru_cache(maxsize=64)
 def derive_key_from_password(password, salt=b'steganography_salt_2025', key_length=32):
     """
     Derives a cryptographic key from a password using PBKDF2
@@ -58,7 +145,8 @@ def derive_key_from_password(password, salt=b'steganography_salt_2025', key_leng
     key_length: 16 (AES-128), 24 (AES-192), 32 (AES-256)
     Returns: derived key
     """
-    key = PBKDF2(password.encode(), salt, key_length, count=100000, hmac_hash_module=SHA256)
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=key_length, salt=salt, iterations=100000)
+    key = kdf.derive(password.encode())
     return key
 
 # -----------------------------
@@ -68,16 +156,18 @@ def aes_gcm_encrypt_with_password(plaintext, password):
     """
     Encrypts plaintext using AES-256-GCM with password-based key derivation
     Includes authentication tag to detect tampering/corruption
+    Runs on OpenSSL (AES-NI for the cipher, PCLMULQDQ for GHASH when available)
     Returns: base64 encoded string containing nonce + tag + ciphertext
     """
     key = derive_key_from_password(password)
-    cipher = AES.new(key, AES.MODE_GCM)
+    nonce = get_random_bytes(16)
     
-    # Encrypt and generate authentication tag
-    ciphertext, tag = cipher.encrypt_and_digest(plaintext.encode())
+    # Encrypt and generate authentication tag (AESGCM appends the 16-byte tag)
+    sealed = AESGCM(key).encrypt(nonce, plaintext.encode(), None)
+    ciphertext, tag = sealed[:-16], sealed[-16:]
     
     # Combine nonce (16 bytes) + tag (16 bytes) + ciphertext
-    encrypted_data = cipher.nonce + tag + ciphertext
+    encrypted_data = nonce + tag + ciphertext
     
     # Return as base64 for easy storage
     return base64.b64encode(encrypted_data).decode('utf-8')
@@ -100,9 +190,8 @@ def aes_gcm_decrypt_with_password(encrypted_data, password):
         ciphertext = data[32:]  # Rest is ciphertext
         
         # Decrypt and verify
-        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-        plaintext = cipher.decrypt_and_verify(ciphertext, tag)
+        plaintext = AESGCM(key).decrypt(nonce, ciphertext + tag, None)
         
         return plaintext.decode('utf-8')
-    except (ValueError, KeyError) as e:
+    except (ValueError, KeyError, InvalidTag) as e:
         raise Exception("Decryption failed: Invalid password or corrupted data")
@@ -0,0 +1,112 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# _adaptive_c.pyx
+"""
+Compiled pixel-pair kernels for adaptive_stego.py
+
+Same embed_block / extract_block contract as the Numba kernels in
+adaptive_stego.py, for deployments that can ship a C extension but not
+Numba/LLVM. No JIT warmup. Build in place with:
+
+    cythonize -i _adaptive_c.pyx
+"""
+
+# Lookup tables indexed by embedding case = MSB(p1) | MSB(p2) << 1
+# (mirrors _P1_MASK, _P2_MASK, _BITS_PER_PAIR, _BIT_SHIFTS in adaptive_stego.py)
+cdef int P1_MASK[4]
+cdef int P2_MASK[4]
+cdef int BITS_PER_PAIR[4]
+cdef int BIT_SHIFTS[4][4]
+
+P1_MASK[:] = [0xFD, 0xF3, 0xFD, 0xF3]
+P2_MASK[:] = [0xFD, 0xFD, 0xF3, 0xF3]
+BITS_PER_PAIR[:] = [2, 3, 3, 4]
+BIT_SHIFTS[0][:] = [9, 1, 0, 0]      # Case 0: bit 1 of p1, bit 1 of p2
+BIT_SHIFTS[1][:] = [10, 11, 1, 0]    # Case 1: bits 2,3 of p1, bit 1 of p2
+BIT_SHIFTS[2][:] = [9, 2, 3, 0]      # Case 2: bit 1 of p1, bits 2,3 of p2
+BIT_SHIFTS[3][:] = [10, 11, 2, 3]    # Case 3: bits 2,3 of both pixels
+
+
+cdef inline int embedding_case(int p1, int p2) noexcept nogil:
+    return ((p1 >> 7) & 1) | (((p2 >> 7) & 1) << 1)
+
+
+cdef Py_ssize_t embed_pairs(unsigned char[:, :] block,
+                            const unsigned char[:, :] pair_mask,
+                            const unsigned char[:] payload_bits,
+                            Py_ssize_t bit_idx) noexcept nogil:
+    cdef Py_ssize_t payload_len = payload_bits.shape[0]
+    cdef Py_ssize_t r, j, k, take
+    cdef int p1, p2, c, need, pair
+
+    for r in range(pair_mask.shape[0]):
+        for j in range(pair_mask.shape[1]):
+            if bit_idx >= payload_len:
+                return bit_idx
+            if not pair_mask[r, j]:
+                continue
+
+            p1 = block[2*r, j]
+            p2 = block[2*r+1, j]
+
+            c = embedding_case(p1, p2)
+            need = BITS_PER_PAIR[c]
+            take = min(need, payload_len - bit_idx)
+
+            # Not enough bits for this case: leave the pair unchanged
+            if take == need:
+                pair = ((p1 & P1_MASK[c]) << 8) | (p2 & P2_MASK[c])
+                for k in range(need):
+                    pair |= payload_bits[bit_idx+k] << BIT_SHIFTS[c][k]
+                block[2*r, j] = <unsigned char>(pair >> 8)
+                block[2*r+1, j] = <unsigned char>(pair & 0xFF)
+
+            bit_idx += take
+
+    return bit_idx
+
+
+cdef Py_ssize_t extract_pairs(const unsigned char[:, :] block,
+                              const unsigned char[:, :] pair_mask,
+                              unsigned char[:] extracted,
+                              Py_ssize_t n) noexcept nogil:
+    cdef Py_ssize_t total = extracted.shape[0]
+    cdef Py_ssize_t r, j, k, take
+    cdef int p1, p2, c, pair
+
+    for r in range(pair_mask.shape[0]):
+        for j in range(pair_mask.shape[1]):
+            if n >= total:
+                return n
+            if not pair_mask[r, j]:
+                continue
+
+            p1 = block[2*r, j]
+            p2 = block[2*r+1, j]
+
+            c = embedding_case(p1, p2)
+            take = min(BITS_PER_PAIR[c], total - n)
+            pair = (p1 << 8) | p2
+
+            for k in range(take):
+                extracted[n+k] = (pair >> BIT_SHIFTS[c][k]) & 1
+            n += take
+
+    return n
+
+
+def embed_block(unsigned char[:, :] block, const unsigned char[:, :] pair_mask,
+                const unsigned char[:] payload_bits, Py_ssize_t bit_idx):
+    """
+    Embed payload bits into the masked pixel pairs of one block (in place)
+    Returns the updated payload bit index
+    """
+    return embed_pairs(block, pair_mask, payload_bits, bit_idx)
+
+
+def extract_block(const unsigned char[:, :] block, const unsigned char[:, :] pair_mask,
+                  unsigned char[:] extracted, Py_ssize_t n):
+    """
+    Extract embedded bits from the masked pixel pairs of one block into extracted
+    Returns the updated number of extracted bits
+    """
+    return extract_pairs(block, pair_mask, extracted, n)
@@ -13,160 +13,309 @@ Enhanced with:
 
 import numpy as np
 import cv2
-from typing import Tuple, List
+from typing import Tuple
 import base64
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; kernels then run as plain Python
+    njit = None
+    prange = range
+
+
+def _jit(func=None, parallel=False):
+    """Compile func with Numba when available, otherwise return it unchanged"""
+    if func is None:
+        return lambda f: _jit(f, parallel)
+    if njit is None:
+        return func
+    return njit(cache=True, parallel=parallel)(func)
+
+
+# 48-bit header embedded in the LSBs of the first row (big-endian fields)
+_HEADER_DTYPE = np.dtype([('UB', 'u1'), ('LB', 'u1'), ('payload_len', '>u4')])
+
+# Lookup tables indexed by embedding case = MSB(p1) | MSB(p2) << 1
+# Bit positions refer to the 16-bit pair word (p1 << 8) | p2
+_P1_MASK = np.array([0xFD, 0xF3, 0xFD, 0xF3], dtype=np.int64)
+_P2_MASK = np.array([0xFD, 0xFD, 0xF3, 0xF3], dtype=np.int64)
+_BITS_PER_PAIR = np.array([2, 3, 3, 4], dtype=np.int64)
+_BIT_SHIFTS = np.array([
+    [9, 1, 0, 0],      # Case 0: bit 1 of p1, bit 1 of p2
+    [10, 11, 1, 0],    # Case 1: bits 2,3 of p1, bit 1 of p2
+    [9, 2, 3, 0],      # Case 2: bit 1 of p1, bits 2,3 of p2
+    [10, 11, 2, 3],    # Case 3: bits 2,3 of both pixels
+], dtype=np.int64)
+
+
+@_jit
+def _embed_block(block, pair_mask, payload_bits, bit_idx):
+    """
+    Embed payload bits into the pixel pairs of one block (in place)
+    
+    Pair (r, j) is the vertically adjacent pixels (2r, j), (2r+1, j); only
+    pairs set in pair_mask (|p1 - p2| <= Me) are used. A pixel with MSB 0
+    carries 1 bit (bit 1), with MSB 1 carries 2 bits (bits 2,3), so a pair
+    carries 2-4 bits (Cases 0-3). If fewer bits remain than the pair needs,
+    the pair is left unchanged.
+    
+    Returns the updated payload bit index
+    """
+    payload_len = payload_bits.shape[0]
+    
+    for r in range(pair_mask.shape[0]):
+        for j in range(pair_mask.shape[1]):
+            if bit_idx >= payload_len:
+                return bit_idx
+            if not pair_mask[r, j]:
+                continue
+            
+            p1 = np.int64(block[2*r, j])
+            p2 = np.int64(block[2*r+1, j])
+            
+            case = ((p1 >> 7) & 1) | (((p2 >> 7) & 1) << 1)
+            need = _BITS_PER_PAIR[case]
+            take = min(need, payload_len - bit_idx)
+            
+            if take == need:
+                pair = ((p1 & _P1_MASK[case]) << 8) | (p2 & _P2_MASK[case])
+                for k in range(need):
+                    pair |= np.int64(payload_bits[bit_idx+k]) << _BIT_SHIFTS[case, k]
+                block[2*r, j] = pair >> 8
+                block[2*r+1, j] = pair & 0xFF
+            
+            bit_idx += take
+    
+    return bit_idx
+
+
+@_jit
+def _extract_block(block, pair_mask, extracted, n):
+    """
+    Extract embedded bits from the masked pixel pairs of one block into extracted
+    Returns the updated number of extracted bits
+    """
+    total = extracted.shape[0]
+    
+    for r in range(pair_mask.shape[0]):
+        for j in range(pair_mask.shape[1]):
+            if n >= total:
+                return n
+            if not pair_mask[r, j]:
+                continue
+            
+            p1 = np.int64(block[2*r, j])
+            p2 = np.int64(block[2*r+1, j])
+            
+            case = ((p1 >> 7) & 1) | (((p2 >> 7) & 1) << 1)
+            take = min(_BITS_PER_PAIR[case], total - n)
+            pair = (p1 << 8) | p2
+            
+            for k in range(take):
+                extracted[n+k] = (pair >> _BIT_SHIFTS[case, k]) & 1
+            n += take
+    
+    return n
+
+
+@_jit(parallel=True)
+def _embed_blocks(image, block_rows, block_cols, block_size, pair_masks, payload_bits, offsets):
+    """
+    Run _embed_block over many blocks of image, block k starting at
+    payload bit offsets[k]; blocks are disjoint, so they run in parallel
+    """
+    for k in prange(offsets.shape[0]):
+        bi, bj = block_rows[k], block_cols[k]
+        _embed_block(image[bi:bi+block_size, bj:bj+block_size],
+                     pair_masks[k], payload_bits, offsets[k])
+
+
+@_jit(parallel=True)
+def _extract_blocks(image, block_rows, block_cols, block_size, pair_masks, extracted, offsets):
+    """
+    Run _extract_block over many blocks of image, block k filling
+    extracted from offsets[k]; blocks are disjoint, so they run in parallel
+    """
+    for k in prange(offsets.shape[0]):
+        bi, bj = block_rows[k], block_cols[k]
+        _extract_block(image[bi:bi+block_size, bj:bj+block_size],
+                       pair_masks[k], extracted, offsets[k])
+
+
+# Without Numba, prefer the Cython kernels when built (cythonize -i _adaptive_c.pyx);
+# otherwise the kernels above run as plain Python
+if njit is None:
+    try:
+        from _adaptive_c import embed_block as _embed_block, extract_block as _extract_block
+    except ImportError:
+        pass
+
 
 class AdaptiveSteganography:
     """
     Adaptive LSB-MSB Steganography with Edge-Adaptive Enhancement
     """
     
-    def __init__(self, block_size=8, edge_threshold=30):
+    def __init__(self, block_size=8, edge_threshold=30, edge_tiers=4):
         """
         Args:
             block_size: Size of image blocks (default 8x8)
-            edge_threshold: Threshold for edge detection (higher = only strong edges)
+            edge_threshold: Threshold for edge detection (higher = only strong edges),
+                compared against the block mean of the L1 Sobel magnitude
+                |Gx| + |Gy|
+            edge_tiers: Number of edge-score tiers visited strongest first;
+                blocks within a tier are visited in scanline order
         """
         self.BLOCK_SIZE = block_size
         self.EDGE_THRESHOLD = edge_threshold
+        self.EDGE_TIERS = edge_tiers
         
-    def _compute_edge_map(self, image: np.ndarray) -> np.ndarray:
+    def _compute_edge_map(self, gray: np.ndarray) -> np.ndarray:
         """
-        Compute edge magnitude using Sobel operator
+        Compute edge magnitude of a grayscale image using Sobel operator
         Higher values indicate edge regions where embedding is less detectable
-        """
-        # Convert to grayscale if needed
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image.copy()
-            
-        # Compute Sobel gradients
-        sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-        sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
         
-        # Edge magnitude
-        edge_magnitude = np.sqrt(sobelx**2 + sobely**2)
+        Uses 16-bit gradients and the L1 magnitude |Gx| + |Gy| (max 2040,
+        fits int16), which avoids float64 temporaries and the sqrt
+        """
+        # Both 3x3 Sobel gradients in one pass over the image (same output
+        # as two cv2.Sobel(CV_16S) calls, but the shared rows are read once)
+        sobelx, sobely = cv2.spatialGradient(gray, ksize=3)
+        
+        # Edge magnitude (L1)
+        np.abs(sobelx, out=sobelx)
+        np.abs(sobely, out=sobely)
+        edge_magnitude = cv2.add(sobelx, sobely)
         return edge_magnitude
     
-    def _partition_into_blocks(self, image: np.ndarray) -> List[np.ndarray]:
+    def _compute_block_edge_scores(self, edge_map: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute the edge score of every full block in a single reduction
+        Returns flat (scores, bi, bj) arrays in row-major block order
+        
+        Scores are int32 block sums of the edge map (max 2040 * bs^2) rather
+        than float64 means: the sum is the mean times a constant, so block
+        order and threshold tests are unchanged without a float reduction
+        """
+        bs = self.BLOCK_SIZE
+        n_rows, n_cols = edge_map.shape[0] // bs, edge_map.shape[1] // bs
+        
+        cropped = edge_map[:n_rows * bs, :n_cols * bs]
+        scores = cropped.reshape(n_rows, bs, n_cols, bs).sum(axis=(1, 3), dtype=np.int32)
+        bi, bj = np.mgrid[0:n_rows * bs:bs, 0:n_cols * bs:bs]
+        
+        return scores.ravel(), bi.ravel(), bj.ravel()
+    
+    def _rank_blocks(self, gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
-        Partition image into 8x8 blocks
-        Returns list of blocks
+        Score blocks of a grayscale image by edge intensity and order them
+        by descending score, skipping the first block (contains UB/LB)
+        Returns (scores, bi, bj, order) arrays
         """
-        h, w = image.shape[:2]
-        blocks = []
-        
-        for i in range(0, h - self.BLOCK_SIZE + 1, self.BLOCK_SIZE):
-            for j in range(0, w - self.BLOCK_SIZE + 1, self.BLOCK_SIZE):
-                block = image[i:i+self.BLOCK_SIZE, j:j+self.BLOCK_SIZE]
-                blocks.append((block, i, j))
-                
-        return blocks
+        edge_map = self._compute_edge_map(gray)
+        scores, block_rows, block_cols = self._compute_block_edge_scores(edge_map)
+        scores, block_rows, block_cols = scores[1:], block_rows[1:], block_cols[1:]
+        order = np.argsort(-scores, kind='stable')
+        
+        return scores, block_rows, block_cols, order
     
-    def _compute_mean_of_medians(self, block: np.ndarray) -> float:
+    def _eligible_blocks(self, scores: np.ndarray, order: np.ndarray) -> np.ndarray:
         """
-        Compute mean-of-medians (Me) for a block
-        1. Find median of each column
-        2. Compute mean of these medians
+        Return the blocks whose edge score meets EDGE_THRESHOLD, in embedding order
+        
+        Eligible blocks are split by rank into EDGE_TIERS equal tiers visited
+        strongest first, but blocks within a tier are visited in scanline
+        (row-major) order. Pure score order jumps randomly across the image;
+        tiering keeps most of the edge priority while restoring spatial
+        locality. A payload smaller than the top tier lands in its leading
+        blocks rather than in the single strongest ones.
         """
-        if len(block.shape) == 3:
-            block = cv2.cvtColor(block, cv2.COLOR_BGR2GRAY)
-            
-        medians = []
-        for col_idx in range(block.shape[1]):
-            column = block[:, col_idx]
-            medians.append(np.median(column))
-            
-        mean_of_medians = np.mean(medians)
-        return mean_of_medians
+        # Scores are block sums, so scale the per-pixel mean threshold
+        min_score = self.EDGE_THRESHOLD * self.BLOCK_SIZE * self.BLOCK_SIZE
+        eligible = order[:np.count_nonzero(scores >= min_score)]
+        if eligible.size == 0:
+            return eligible
+        
+        # Block indices are row-major, so sorting a tier restores scanline order
+        tiers = np.array_split(eligible, max(1, self.EDGE_TIERS))
+        return np.concatenate([np.sort(tier) for tier in tiers])
     
-    def _get_embedding_case(self, p1: int, p2: int) -> int:
+    def _compute_mean_of_medians(self, blocks: np.ndarray) -> np.ndarray:
         """
-        Determine embedding case based on MSB patterns
-        
-        Case 0: MSB(p1)==MSB(p2)==0 -> embed in bit 1 of both pixels
-        Case 1: MSB(p1)==1, MSB(p2)==0 -> embed in bits 2,3 of p1 and bit 1 of p2
-        Case 2: MSB(p1)==0, MSB(p2)==1 -> embed in bit 1 of p1 and bits 2,3 of p2
-        Case 3: MSB(p1)==MSB(p2)==1 -> embed in bits 2,3 of both pixels
+        Compute mean-of-medians (Me) for a stack of grayscale blocks
+        1. Find median of each column
+        2. Compute mean of these medians
+        Takes (..., rows, cols) blocks, returns (...) Me values
         """
-        msb_p1 = (p1 >> 7) & 1
-        msb_p2 = (p2 >> 7) & 1
-        
-        if msb_p1 == 0 and msb_p2 == 0:
-            return 0
-        elif msb_p1 == 1 and msb_p2 == 0:
-            return 1
-        elif msb_p1 == 0 and msb_p2 == 1:
-            return 2
-        else:  # both MSBs are 1
-            return 3
+        # Column medians in a single vectorized call
+        medians = np.median(blocks, axis=-2)
+        return medians.mean(axis=-1)
     
-    def _embed_bits_in_pixel_pair(self, p1: int, p2: int, bits: List[int]) -> Tuple[int, int]:
+    def _compute_pair_mask(self, blocks: np.ndarray, Me: np.ndarray) -> np.ndarray:
         """
-        Embed bits into pixel pair based on MSB case
-        Returns modified (p1, p2)
+        Pixel difference threshold for every vertical pixel pair of a stack of blocks
+        Returns (..., rows/2, cols) 0/1 uint8 mask of pairs with |p1 - p2| <= Me
+        (uint8 rather than bool so compiled kernels can take it as a byte buffer)
         """
-        case = self._get_embedding_case(p1, p2)
-        
-        if case == 0:
-            # Embed in bit position 1 (LSB+1) of both pixels
-            if len(bits) >= 2:
-                p1 = (p1 & 0b11111101) | (bits[0] << 1)
-                p2 = (p2 & 0b11111101) | (bits[1] << 1)
-        
-        elif case == 1:
-            # Embed in bits 2,3 of p1 and bit 1 of p2
-            if len(bits) >= 3:
-                p1 = (p1 & 0b11110011) | (bits[0] << 2) | (bits[1] << 3)
-                p2 = (p2 & 0b11111101) | (bits[2] << 1)
-        
-        elif case == 2:
-            # Embed in bit 1 of p1 and bits 2,3 of p2
-            if len(bits) >= 3:
-                p1 = (p1 & 0b11111101) | (bits[0] << 1)
-                p2 = (p2 & 0b11110011) | (bits[1] << 2) | (bits[2] << 3)
-        
-        elif case == 3:
-            # Embed in bits 2,3 of both pixels
-            if len(bits) >= 4:
-                p1 = (p1 & 0b11110011) | (bits[0] << 2) | (bits[1] << 3)
-                p2 = (p2 & 0b11110011) | (bits[2] << 2) | (bits[3] << 3)
-        
-        return p1, p2
+        n = blocks.shape[-2] // 2 * 2
+        Di = np.abs(blocks[..., 0:n:2, :].astype(np.int16) - blocks[..., 1:n:2, :])
+        return (Di <= np.asarray(Me)[..., None, None]).view(np.uint8)
     
-    def _extract_bits_from_pixel_pair(self, p1: int, p2: int) -> List[int]:
+    def _plan_blocks(self, image: np.ndarray, block_rows: np.ndarray, block_cols: np.ndarray,
+                     blocks: np.ndarray, total_bits: int) -> Tuple[np.ndarray, ...]:
         """
-        Extract embedded bits from pixel pair based on MSB case
+        Work out which of blocks (in visiting order) carry total_bits and
+        the payload bit offset at which each one starts
+        
+        Me and the pair mask depend only on a block's own pixels, and a pair's
+        capacity only on its MSBs, which embedding never modifies, so every
+        block's bit range is known before any pixel is touched. Blocks are
+        planned in doubling batches so a small payload does not pay for
+        every eligible block of a large image.
+        
+        Returns:
+            (rows, cols, pair_masks, offsets, n_bits) for the blocks the
+            sequential scan would visit, n_bits being the bits they carry
         """
-        case = self._get_embedding_case(p1, p2)
-        bits = []
-        
-        if case == 0:
-            bits.append((p1 >> 1) & 1)
-            bits.append((p2 >> 1) & 1)
-        
-        elif case == 1:
-            bits.append((p1 >> 2) & 1)
-            bits.append((p1 >> 3) & 1)
-            bits.append((p2 >> 1) & 1)
-        
-        elif case == 2:
-            bits.append((p1 >> 1) & 1)
-            bits.append((p2 >> 2) & 1)
-            bits.append((p2 >> 3) & 1)
-        
-        elif case == 3:
-            bits.append((p1 >> 2) & 1)
-            bits.append((p1 >> 3) & 1)
-            bits.append((p2 >> 2) & 1)
-            bits.append((p2 >> 3) & 1)
-        
-        return bits
+        bs = self.BLOCK_SIZE
+        n_rows, n_cols = image.shape[0] // bs, image.shape[1] // bs
+        grid = image[:n_rows * bs, :n_cols * bs].reshape(n_rows, bs, n_cols, bs)
+        
+        planned = []
+        covered = 0
+        start = 0
+        batch = max(256, total_bits // ((bs // 2) * bs * 4) + 1)
+        
+        while covered < total_bits and start < len(blocks):
+            idx = blocks[start:start + batch]
+            rows, cols = block_rows[idx], block_cols[idx]
+            stack = grid[rows // bs, :, cols // bs, :]
+            
+            Me = self._compute_mean_of_medians(stack)
+            pair_masks = self._compute_pair_mask(stack, Me)
+            
+            # A masked pair carries 2 bits plus 1 per pixel with MSB set
+            msb = stack[:, :pair_masks.shape[1] * 2] >> 7
+            caps = ((msb[:, 0::2] + msb[:, 1::2] + 2) * pair_masks).sum(axis=(1, 2), dtype=np.int64)
+            
+            planned.append((rows, cols, pair_masks, caps))
+            covered += int(caps.sum())
+            start += batch
+            batch *= 2
+        
+        if not planned:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty((0, bs // 2, bs), dtype=np.uint8), empty, 0
+        
+        rows, cols, pair_masks, caps = (np.concatenate(parts) for parts in zip(*planned))
+        offsets = np.cumsum(caps) - caps
+        used = np.count_nonzero(offsets < total_bits)
+        
+        return (rows[:used], cols[:used], pair_masks[:used], offsets[:used],
+                min(covered, total_bits))
     
     def encode(self, cover_image_path: str, output_path: str, 
-               payload_bytes: bytes) -> dict:
+               payload_bytes: bytes, cover_image: np.ndarray = None) -> dict:
         """
         Embed payload into image using adaptive LSB-MSB with edge enhancement
         
@@ -174,116 +323,73 @@ class AdaptiveSteganography:
             cover_image_path: Path to cover image
             output_path: Path to save stego image
             payload_bytes: Encrypted payload to embed
+            cover_image: Optional already-decoded cover (BGR or grayscale);
+                skips reading cover_image_path when several runs share a cover
             
         Returns:
             dict with metadata (UB, LB, capacity, etc.)
         """
         # Load image
-        image = cv2.imread(cover_image_path)
-        if image is None:
-            raise ValueError(f"Cannot load image: {cover_image_path}")
-        
-        # Compute edge map for edge-adaptive embedding
-        edge_map = self._compute_edge_map(image)
-        
-        # Convert payload to bit string
-        payload_bits = ''.join(format(byte, '08b') for byte in payload_bytes)
-        payload_len = len(payload_bits)
-        
-        print(f"[*] Payload size: {len(payload_bytes)} bytes ({payload_len} bits)")
+        if cover_image is None:
+            image = cv2.imread(cover_image_path)
+            if image is None:
+                raise ValueError(f"Cannot load image: {cover_image_path}")
+        else:
+            image = cover_image
         
-        # Convert to grayscale for embedding
+        # Convert to grayscale once; the fresh cvtColor buffer is embedded
+        # into in place, so no separate stego copy is needed
         if len(image.shape) == 3:
-            gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            stego_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
-            gray_image = image.copy()
+            # Never modify a caller-provided array in place
+            stego_image = image if cover_image is None else image.copy()
         
-        stego_image = gray_image.copy()
-        h, w = stego_image.shape
+        # Rank blocks by edge intensity (prioritize edge regions)
+        scores, block_rows, block_cols, order = self._rank_blocks(stego_image)
         
-        # Calculate UB and LB (Upper and Lower Bounds)
-        UB = int(np.max(gray_image))
-        LB = int(np.min(gray_image))
+        # Convert payload to a 0/1 bit array (MSB first)
+        payload_bits = np.unpackbits(np.frombuffer(payload_bytes, dtype=np.uint8))
+        payload_len = payload_bits.size
         
-        print(f"[*] Image bounds: UB={UB}, LB={LB}")
+        print(f"[*] Payload size: {len(payload_bytes)} bytes ({payload_len} bits)")
         
-        # Embed UB and LB in first 16 pixels (2 bytes each in LSB)
-        # UB in first 8 pixels, LB in next 8 pixels
-        ub_bits = format(UB, '08b')
-        lb_bits = format(LB, '08b')
+        # Only blocks with sufficient edge strength are used; fail fast if even
+        # a 4-bit embedding in every pixel pair could not hold the payload
+        eligible = self._eligible_blocks(scores, order)
+        max_bits = len(eligible) * (self.BLOCK_SIZE // 2) * self.BLOCK_SIZE * 4
+        if payload_len > max_bits:
+            raise ValueError(
+                f"Insufficient capacity: {len(eligible)} blocks above edge threshold "
+                f"{self.EDGE_THRESHOLD} hold at most {max_bits} bits, "
+                f"payload needs {payload_len}"
+            )
         
-        for i in range(8):
-            stego_image[0, i] = (stego_image[0, i] & 0xFE) | int(ub_bits[i])
-            stego_image[0, i+8] = (stego_image[0, i+8] & 0xFE) | int(lb_bits[i])
+        h, w = stego_image.shape
         
-        # Embed payload length in next 32 pixels (4 bytes)
-        len_bits = format(payload_len, '032b')
-        for i in range(32):
-            stego_image[0, i+16] = (stego_image[0, i+16] & 0xFE) | int(len_bits[i])
+        # Calculate UB and LB (Upper and Lower Bounds) before any bit is modified
+        UB = int(stego_image.max())
+        LB = int(stego_image.min())
         
-        # Partition into blocks
-        blocks = self._partition_into_blocks(stego_image)
+        print(f"[*] Image bounds: UB={UB}, LB={LB}")
         
-        # Track embedding statistics
-        bit_idx = 0
-        embedded_bits = 0
-        blocks_used = 0
+        # Embed 48-bit header in LSBs of the first row:
+        # UB in first 8 pixels, LB in next 8 pixels,
+        # payload length in next 32 pixels (4 bytes, big-endian)
+        header = np.array([(UB, LB, payload_len)], dtype=_HEADER_DTYPE)
+        header_bits = np.unpackbits(header.view(np.uint8))
+        stego_image[0, :48] = (stego_image[0, :48] & 0xFE) | header_bits
         
-        # Sort blocks by edge intensity (prioritize edge regions)
-        block_edge_scores = []
-        for block, bi, bj in blocks[1:]:  # Skip first block (contains UB/LB)
-            edge_score = np.mean(edge_map[bi:bi+self.BLOCK_SIZE, bj:bj+self.BLOCK_SIZE])
-            block_edge_scores.append((edge_score, block, bi, bj))
+        print(f"[*] Processing {len(eligible)}/{len(order)} blocks (edge-adaptive order)")
         
-        # Sort by edge score (descending) for edge-adaptive embedding
-        block_edge_scores.sort(reverse=True, key=lambda x: x[0])
+        # Mean-of-medians threshold, pair masks and starting bit of every block
+        # needed, then embed in all of them at once
+        rows, cols, pair_masks, offsets, embedded_bits = self._plan_blocks(
+            stego_image, block_rows, block_cols, eligible, payload_len)
+        blocks_used = len(offsets)
         
-        print(f"[*] Processing {len(block_edge_scores)} blocks (edge-adaptive order)")
-        
-        # Embed in blocks
-        for edge_score, block, bi, bj in block_edge_scores:
-            if bit_idx >= payload_len:
-                break
-            
-            # Only embed in blocks with sufficient edge strength
-            if edge_score < self.EDGE_THRESHOLD:
-                continue
-                
-            # Compute mean-of-medians for adaptive threshold
-            Me = self._compute_mean_of_medians(block)
-            
-            # Process pixel pairs in the block
-            for i in range(0, self.BLOCK_SIZE - 1, 2):
-                for j in range(0, self.BLOCK_SIZE):
-                    if bit_idx >= payload_len:
-                        break
-                    
-                    p1 = int(stego_image[bi+i, bj+j])
-                    p2 = int(stego_image[bi+i+1, bj+j])
-                    
-                    # Pixel difference threshold (adaptive)
-                    Di = abs(p1 - p2)
-                    
-                    if Di <= Me:
-                        # Determine how many bits we can embed
-                        case = self._get_embedding_case(p1, p2)
-                        bits_per_pair = [2, 3, 3, 4][case]
-                        
-                        # Extract bits from payload
-                        bits_to_embed = []
-                        for _ in range(bits_per_pair):
-                            if bit_idx < payload_len:
-                                bits_to_embed.append(int(payload_bits[bit_idx]))
-                                bit_idx += 1
-                        
-                        if bits_to_embed:
-                            # Embed bits
-                            p1_new, p2_new = self._embed_bits_in_pixel_pair(p1, p2, bits_to_embed)
-                            stego_image[bi+i, bj+j] = p1_new
-                            stego_image[bi+i+1, bj+j] = p2_new
-                            embedded_bits += len(bits_to_embed)
-            
-            blocks_used += 1
+        _embed_blocks(stego_image, rows, cols, self.BLOCK_SIZE, pair_masks, payload_bits, offsets)
+        bit_idx = embedded_bits
         
         if bit_idx < payload_len:
             print(f"[!] Warning: Only embedded {bit_idx}/{payload_len} bits")
@@ -323,70 +429,30 @@ class AdaptiveSteganography:
         
         h, w = image.shape
         
-        # Extract UB and LB from first 16 pixels
-        ub_bits = ''.join(str(image[0, i] & 1) for i in range(8))
-        lb_bits = ''.join(str(image[0, i+8] & 1) for i in range(8))
-        UB = int(ub_bits, 2)
-        LB = int(lb_bits, 2)
+        # Read 48-bit header from LSBs of the first row:
+        # UB and LB from first 16 pixels, payload length from next 32
+        header = np.packbits(image[0, :48] & 1).view(_HEADER_DTYPE)[0]
+        UB, LB = int(header['UB']), int(header['LB'])
         
         print(f"[*] Extracted bounds: UB={UB}, LB={LB}")
         
-        # Extract payload length from next 32 pixels
-        len_bits = ''.join(str(image[0, i+16] & 1) for i in range(32))
-        payload_len = int(len_bits, 2)
+        payload_len = int(header['payload_len'])
         
         print(f"[*] Payload length: {payload_len} bits ({payload_len//8} bytes)")
         
-        # Compute edge map (same as encoding)
-        edge_map = self._compute_edge_map(image)
-        
-        # Partition into blocks
-        blocks = self._partition_into_blocks(image)
-        
         # Sort blocks by edge score (same order as encoding)
-        block_edge_scores = []
-        for block, bi, bj in blocks[1:]:
-            edge_score = np.mean(edge_map[bi:bi+self.BLOCK_SIZE, bj:bj+self.BLOCK_SIZE])
-            block_edge_scores.append((edge_score, block, bi, bj))
+        scores, block_rows, block_cols, order = self._rank_blocks(image)
         
-        block_edge_scores.sort(reverse=True, key=lambda x: x[0])
+        # Extract bits into a preallocated buffer; only extracted[:n] is ever
+        # read, so it needs no zero-fill. A pixel pair holds at most 4 bits, so
+        # the buffer never exceeds 2 bits per pixel even if the header is bogus
+        extracted = np.empty(min(payload_len, 2 * h * w), dtype=np.uint8)
         
-        # Extract bits
-        extracted_bits = []
+        rows, cols, pair_masks, offsets, n = self._plan_blocks(
+            image, block_rows, block_cols, self._eligible_blocks(scores, order), extracted.size)
+        _extract_blocks(image, rows, cols, self.BLOCK_SIZE, pair_masks, extracted, offsets)
         
-        for edge_score, block, bi, bj in block_edge_scores:
-            if len(extracted_bits) >= payload_len:
-                break
-            
-            if edge_score < self.EDGE_THRESHOLD:
-                continue
-            
-            Me = self._compute_mean_of_medians(block)
-            
-            for i in range(0, self.BLOCK_SIZE - 1, 2):
-                for j in range(0, self.BLOCK_SIZE):
-                    if len(extracted_bits) >= payload_len:
-                        break
-                    
-                    p1 = int(image[bi+i, bj+j])
-                    p2 = int(image[bi+i+1, bj+j])
-                    
-                    Di = abs(p1 - p2)
-                    
-                    if Di <= Me:
-                        bits = self._extract_bits_from_pixel_pair(p1, p2)
-                        for bit in bits:
-                            if len(extracted_bits) < payload_len:
-                                extracted_bits.append(bit)
-        
-        print(f"[*] Extracted {len(extracted_bits)}/{payload_len} bits")
-        
-        # Convert bits to bytes
-        payload_bytes = bytearray()
-        for i in range(0, len(extracted_bits), 8):
-            if i + 8 <= len(extracted_bits):
-                byte_bits = extracted_bits[i:i+8]
-                byte_val = int(''.join(map(str, byte_bits)), 2)
-                payload_bytes.append(byte_val)
-        
-        return bytes(payload_bytes)
+        print(f"[*] Extracted {n}/{payload_len} bits")
+        
+        # Convert bits to bytes in one call (trailing partial byte is dropped)
+        return np.packbits(extracted[:n - n % 8]).tobytes()
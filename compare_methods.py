@@ -10,7 +10,9 @@ This script compares three steganographic methods:
 
 import sys
 import os
-from AESCTR import aes_ctr_encrypt, aes_ctr_decrypt
+import base64
+import cv2
+from AESCTR import aes_ctr_encrypt_payload, aes_ctr_decrypt
 from steno import SteganographyLSB
 from adaptive_stego import AdaptiveSteganography
 from metricscalc import comprehensive_evaluation, print_evaluation_results
@@ -30,8 +32,10 @@ def compare_methods(cover_image: str, secret_message: str):
     
     # Encrypt message once (same for all methods)
     print("\n[*] Encrypting message with AES-CTR...")
-    key, nonce, ciphertext = aes_ctr_encrypt(secret_message.encode())
-    payload_bytes = nonce + ciphertext
+    key, payload_bytes = aes_ctr_encrypt_payload(secret_message.encode())
+    
+    # Decode the cover once and share it between the adaptive runs
+    cover = cv2.imread(cover_image)
     
     results = {}
     
@@ -44,9 +48,9 @@ def compare_methods(cover_image: str, secret_message: str):
         output_basic = "media/comparison_basic_lsb.png"
         stego_basic = SteganographyLSB()
         
-        # Encode with base64 for basic LSB
-        import base64
-        data_to_hide = base64.b64encode(payload_bytes).decode('utf-8')
+        # Basic LSB embeds text; Base85 expands the payload by 1.25x
+        # instead of Base64's 1.33x
+        data_to_hide = base64.b85encode(payload_bytes).decode('ascii')
         
         stego_basic.encode(cover_image, output_basic, data_to_hide, password="test")
         print("[✓] Basic LSB embedding complete")
@@ -75,7 +79,8 @@ def compare_methods(cover_image: str, secret_message: str):
         output_adaptive = "media/comparison_adaptive.png"
         stego_adaptive = AdaptiveSteganography(block_size=8, edge_threshold=10)  # Low threshold = more blocks
         
-        metadata_adaptive = stego_adaptive.encode(cover_image, output_adaptive, payload_bytes)
+        metadata_adaptive = stego_adaptive.encode(cover_image, output_adaptive, payload_bytes,
+                                                  cover_image=cover)
         print("[✓] Adaptive LSB-MSB embedding complete")
         print(f"[*] Capacity: {metadata_adaptive['capacity_bpp']:.4f} bpp")
         
@@ -104,7 +109,8 @@ def compare_methods(cover_image: str, secret_message: str):
         output_edge = "media/comparison_edge_enhanced.png"
         stego_edge = AdaptiveSteganography(block_size=8, edge_threshold=30)  # Higher threshold = only edges
         
-        metadata_edge = stego_edge.encode(cover_image, output_edge, payload_bytes)
+        metadata_edge = stego_edge.encode(cover_image, output_edge, payload_bytes,
+                                          cover_image=cover)
         print("[✓] Edge-enhanced embedding complete")
         print(f"[*] Capacity: {metadata_edge['capacity_bpp']:.4f} bpp")
         
@@ -134,39 +140,32 @@ def compare_methods(cover_image: str, secret_message: str):
     ))
     print("-"*70)
     
+    methods = ['basic_lsb', 'adaptive', 'edge_enhanced']
     metrics_to_compare = ['PSNR', 'MSE', 'Entropy_Difference', 'Histogram_Deviation']
     
-    for metric in metrics_to_compare:
-        row = f"{metric:<25}"
-        
-        for method in ['basic_lsb', 'adaptive', 'edge_enhanced']:
-            if method in results and 'metrics' in results[method]:
-                val = results[method]['metrics'].get(metric, 'N/A')
-                if isinstance(val, (int, float)):
-                    if metric == 'PSNR':
-                        row += f"{val:>14.2f} "
-                    else:
-                        row += f"{val:>14.4f} "
-                else:
-                    row += f"{str(val):>15}"
-            else:
-                row += f"{'ERROR':>15}"
-        
-        print(row)
+    # Look up each method's metrics once (None = method failed)
+    metrics_by_method = {m: results.get(m, {}).get('metrics') for m in methods}
     
-    # Capacity comparison
-    print("-"*70)
-    row = f"{'Capacity (bpp)':<25}"
-    for method in ['basic_lsb', 'adaptive', 'edge_enhanced']:
-        if method in results and 'metrics' in results[method]:
-            val = results[method]['metrics'].get('Capacity_bpp', 'N/A')
+    def format_row(label, metric, precision, missing):
+        row = f"{label:<25}"
+        for method in methods:
+            metrics = metrics_by_method[method]
+            if metrics is None:
+                row += f"{missing:>15}"
+                continue
+            val = metrics.get(metric, 'N/A')
             if isinstance(val, (int, float)):
-                row += f"{val:>14.4f} "
+                row += f"{val:>14.{precision}f} "
             else:
                 row += f"{str(val):>15}"
-        else:
-            row += f"{'N/A':>15}"
-    print(row)
+        return row
+    
+    for metric in metrics_to_compare:
+        print(format_row(metric, metric, 2 if metric == 'PSNR' else 4, 'ERROR'))
+    
+    # Capacity comparison
+    print("-"*70)
+    print(format_row('Capacity (bpp)', 'Capacity_bpp', 4, 'N/A'))
     
     print("="*70)
     
@@ -199,10 +198,8 @@ def compare_methods(cover_image: str, secret_message: str):
     print("\n📊 Quality Analysis:")
     
     # Best PSNR
-    psnr_values = {}
-    for method in ['basic_lsb', 'adaptive', 'edge_enhanced']:
-        if method in results and 'metrics' in results[method]:
-            psnr_values[method] = results[method]['metrics'].get('PSNR', 0)
+    psnr_values = {m: metrics.get('PSNR', 0)
+                   for m, metrics in metrics_by_method.items() if metrics is not None}
     
     if psnr_values:
         best_psnr = max(psnr_values, key=psnr_values.get)
@@ -214,10 +211,8 @@ def compare_methods(cover_image: str, secret_message: str):
         print(f"✓ Best Quality (PSNR): {method_names[best_psnr]} ({psnr_values[best_psnr]:.2f} dB)")
     
     # Histogram deviation
-    hist_values = {}
-    for method in ['basic_lsb', 'adaptive', 'edge_enhanced']:
-        if method in results and 'metrics' in results[method]:
-            hist_values[method] = results[method]['metrics'].get('Histogram_Deviation', 999)
+    hist_values = {m: metrics.get('Histogram_Deviation', 999)
+                   for m, metrics in metrics_by_method.items() if metrics is not None}
     
     if hist_values:
         best_hist = min(hist_values, key=hist_values.get)
@@ -16,9 +16,10 @@ Improvements over basic LSB:
 
 import sys
 import base64
+import codecs
 import os
 
-from AESCTR import aes_ctr_encrypt, aes_ctr_decrypt
+from AESCTR import aes_ctr_encrypt_payload, aes_ctr_decrypt, aes_backend_banner
 from adaptive_stego import AdaptiveSteganography
 from metricscalc import comprehensive_evaluation, print_evaluation_results
 
@@ -40,10 +41,8 @@ def hide_message_adaptive(input_image, output_image, secret_message, edge_thresh
     print("ENCRYPTION PHASE")
     print("="*60)
     print("[*] Encrypting secret message with AES-CTR...")
-    key, nonce, ciphertext = aes_ctr_encrypt(secret_message.encode())
-    
-    # Combine nonce + ciphertext for embedding
-    payload_bytes = nonce + ciphertext
+    # Encrypted straight into the nonce + ciphertext embedding payload
+    key, payload_bytes = aes_ctr_encrypt_payload(secret_message.encode())
     print(f"[*] Payload size: {len(payload_bytes)} bytes")
     
     print("\n" + "="*60)
@@ -87,8 +86,10 @@ def extract_message_adaptive(stego_image, key, edge_threshold=30):
     if len(payload_bytes) < 8:
         raise ValueError("Extracted payload too small - extraction may have failed")
     
-    nonce = payload_bytes[:8]
-    ciphertext = payload_bytes[8:]
+    # Ciphertext is a view into the payload rather than a sliced copy
+    payload_view = memoryview(payload_bytes)
+    nonce = bytes(payload_view[:8])
+    ciphertext = payload_view[8:]
     
     print(f"[*] Nonce: {nonce.hex()[:16]}...")
     print(f"[*] Ciphertext size: {len(ciphertext)} bytes")
@@ -104,17 +105,26 @@ def extract_message_adaptive(stego_image, key, edge_threshold=30):
     print("[✓] Decryption complete!")
     print(f"[*] Decrypted data size: {len(decrypted_message)} bytes")
     
-    # Try to decode with multiple encodings
-    for encoding in ['utf-8', 'latin-1', 'ascii', 'utf-16']:
-        try:
-            decoded = decrypted_message.decode(encoding)
-            # Check if it's printable
-            if decoded.isprintable() or encoding == 'utf-8':
-                if encoding != 'utf-8':
-                    print(f"[!] Note: Decoded using {encoding} encoding")
-                return decoded
-        except (UnicodeDecodeError, UnicodeError):
-            continue
+    # Messages are embedded as UTF-8, so a strict UTF-8 decode settles the
+    # normal case in one pass; only on failure pick a single fallback from
+    # the leading bytes (UTF-16 BOM, else latin-1) instead of probing each
+    try:
+        return decrypted_message.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    
+    if decrypted_message[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        encoding = 'utf-16'
+    else:
+        encoding = 'latin-1'
+    
+    try:
+        decoded = decrypted_message.decode(encoding)
+        if decoded.isprintable():
+            print(f"[!] Note: Decoded using {encoding} encoding")
+            return decoded
+    except UnicodeDecodeError:
+        pass
     
     # If all encodings fail, show hex dump for debugging
     print("\n[!] Warning: Could not decode as text. Showing hex dump:")
@@ -160,6 +170,7 @@ if __name__ == "__main__":
     print("  • Edge-Adaptive Enhancement (Sobel-based)")
     print("  • Comprehensive Quality Evaluation")
     print("="*70)
+    print(aes_backend_banner())
     
     # Check if cover image exists
     if not os.path.exists(DEFAULT_IMAGE):
@@ -1,20 +1,61 @@
+import hashlib
 import cv2
 import numpy as np
 import math
+from collections import OrderedDict
 from typing import Tuple, Dict
 
 
+# Decoded grayscale images keyed by a hash of the file bytes, so a file
+# rewritten in place (same size, same mtime tick) is never served stale pixels
+_GRAY_CACHE = OrderedDict()
+_GRAY_CACHE_SIZE = 8
+
+
+def _load_gray(path):
+    """
+    Load an image as grayscale, reusing the decoded array for files with
+    identical content; returns None if unreadable
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    image = _GRAY_CACHE.get(key)
+    if image is not None:
+        _GRAY_CACHE.move_to_end(key)
+        return image
+
+    # Decode the bytes already read for the hash
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return None
+    # Shared between callers, so guard against in-place modification
+    image.flags.writeable = False
+
+    _GRAY_CACHE[key] = image
+    if len(_GRAY_CACHE) > _GRAY_CACHE_SIZE:
+        _GRAY_CACHE.popitem(last=False)
+    return image
+
+
 def calculate_mse(original, stego):
     """Calculate Mean Squared Error between two images"""
-    original = original.astype(np.float64)
-    stego = stego.astype(np.float64)
-    mse = np.mean((original - stego) ** 2)
+    # Sum of squared differences in one SIMD pass, no temporaries
+    mse = cv2.norm(original, stego, cv2.NORM_L2SQR) / original.size
     return mse
 
 
 def calculate_psnr(original, stego):
     """Calculate Peak Signal-to-Noise Ratio"""
-    mse = calculate_mse(original, stego)
+    return _psnr_from_mse(calculate_mse(original, stego))
+
+
+def _psnr_from_mse(mse):
+    """PSNR for 8-bit images from a precomputed MSE"""
     if mse == 0:
         return float('inf')
     MAX = 255.0
@@ -31,8 +72,12 @@ def calculate_entropy(image):
         image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
     # Calculate histogram
-    hist, _ = np.histogram(image.flatten(), bins=256, range=(0, 256))
-    
+    hist = np.bincount(image.ravel(), minlength=256)
+    return _entropy_from_histogram(hist)
+
+
+def _entropy_from_histogram(hist):
+    """Shannon entropy from a 256-bin intensity histogram"""
     # Normalize to get probability distribution
     hist = hist / hist.sum()
     
@@ -64,9 +109,13 @@ def calculate_histogram_deviation(original, stego):
         stego = cv2.cvtColor(stego, cv2.COLOR_BGR2GRAY)
     
     # Calculate histograms
-    hist_orig, _ = np.histogram(original.flatten(), bins=256, range=(0, 256))
-    hist_stego, _ = np.histogram(stego.flatten(), bins=256, range=(0, 256))
-    
+    hist_orig = np.bincount(original.ravel(), minlength=256)
+    hist_stego = np.bincount(stego.ravel(), minlength=256)
+    return _histogram_deviation(hist_orig, hist_stego)
+
+
+def _histogram_deviation(hist_orig, hist_stego):
+    """Chi-square distance between two 256-bin intensity histograms"""
     # Normalize
     hist_orig = hist_orig.astype(np.float64) / hist_orig.sum()
     hist_stego = hist_stego.astype(np.float64) / hist_stego.sum()
@@ -84,8 +133,8 @@ def comprehensive_evaluation(original_path: str, stego_path: str,
     
     Returns dict with all metrics: PSNR, MSE, Entropy, Capacity, Histogram Deviation
     """
-    original = cv2.imread(original_path, cv2.IMREAD_GRAYSCALE)
-    stego = cv2.imread(stego_path, cv2.IMREAD_GRAYSCALE)
+    original = _load_gray(original_path)
+    stego = _load_gray(stego_path)
     
     if original is None:
         raise ValueError(f"Could not load original image: {original_path}")
@@ -94,12 +143,17 @@ def comprehensive_evaluation(original_path: str, stego_path: str,
     if original.shape != stego.shape:
         raise ValueError("Images must have the same dimensions")
     
+    # One histogram per image feeds both entropies and the deviation,
+    # and PSNR reuses the MSE, so each image is only traversed twice
+    hist_orig = np.bincount(original.ravel(), minlength=256)
+    hist_stego = np.bincount(stego.ravel(), minlength=256)
+    
     # Calculate all metrics
     mse_value = calculate_mse(original, stego)
-    psnr_value = calculate_psnr(original, stego)
-    entropy_orig = calculate_entropy(original)
-    entropy_stego = calculate_entropy(stego)
-    hist_deviation = calculate_histogram_deviation(original, stego)
+    psnr_value = _psnr_from_mse(mse_value)
+    entropy_orig = _entropy_from_histogram(hist_orig)
+    entropy_stego = _entropy_from_histogram(hist_stego)
+    hist_deviation = _histogram_deviation(hist_orig, hist_stego)
     
     results = {
         'MSE': mse_value,
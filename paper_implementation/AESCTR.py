@@ -1,9 +1,13 @@
-from Cryptodome.Cipher import AES
 from Cryptodome.Random import get_random_bytes
-from Cryptodome.Protocol.KDF import PBKDF2
 from Cryptodome.Hash import SHA256, HMAC
+from cryptography.hazmat.primitives import hashes
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import os
 import base64
+from functools import lru_cache
 
 # -----------------------------
 # Utility Functions
@@ -24,6 +28,14 @@ def load_ciphertext(file_path, nonce_length=8):
 # -----------------------------
 # AES-CTR Encryption
 # -----------------------------
+def _ctr_cipher(key, nonce):
+    """
+    AES-CTR cipher on OpenSSL (EVP, AES-NI when available)
+    Counter block is the 8-byte nonce followed by a 64-bit big-endian
+    counter from 0, the same layout PyCryptodome uses for MODE_CTR
+    """
+    return Cipher(algorithms.AES(key), modes.CTR(nonce.ljust(16, b'\0')))
+
 def aes_ctr_encrypt(data, key_size=32):
     """
     Encrypts data using AES-CTR
@@ -32,8 +44,8 @@ def aes_ctr_encrypt(data, key_size=32):
     """
     key = get_random_bytes(key_size)      # AES key
     nonce = get_random_bytes(8)           # CTR nonce
-    cipher = AES.new(key, AES.MODE_CTR, nonce=nonce)
-    ciphertext = cipher.encrypt(data)
+    encryptor = _ctr_cipher(key, nonce).encryptor()
+    ciphertext = encryptor.update(data) + encryptor.finalize()
     return key, nonce, ciphertext
 
 # -----------------------------
@@ -43,13 +55,16 @@ def aes_ctr_decrypt(ciphertext, key, nonce):
     """
     Decrypts AES-CTR ciphertext
     """
-    cipher = AES.new(key, AES.MODE_CTR, nonce=nonce)
-    plaintext = cipher.decrypt(ciphertext)
+    decryptor = _ctr_cipher(key, nonce).decryptor()
+    plaintext = decryptor.update(ciphertext) + decryptor.finalize()
     return plaintext
 
 # -----------------------------
 # Password-based Key Derivation
 # -----------------------------
+# The salt is fixed, so the same password always derives the same key;
+# caching it skips 100k PBKDF2 iterations on every repeat encrypt/decrypt
+@lru_cache(maxsize=64)
 def derive_key_from_password(password, salt=b'steganography_salt_2025', key_length=32):
     """
     Derives a cryptographic key from a password using PBKDF2
@@ -58,7 +73,8 @@ def derive_key_from_password(password, salt=b'steganography_salt_2025', key_leng
     key_length: 16 (AES-128), 24 (AES-192), 32 (AES-256)
     Returns: derived key
     """
-    key = PBKDF2(password.encode(), salt, key_length, count=100000, hmac_hash_module=SHA256)
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=key_length, salt=salt, iterations=100000)
+    key = kdf.derive(password.encode())
     return key
 
 # -----------------------------
@@ -68,16 +84,18 @@ def aes_gcm_encrypt_with_password(plaintext, password):
     """
     Encrypts plaintext using AES-256-GCM with password-based key derivation
     Includes authentication tag to detect tampering/corruption
+    Runs on OpenSSL (AES-NI for the cipher, PCLMULQDQ for GHASH when available)
     Returns: base64 encoded string containing nonce + tag + ciphertext
     """
     key = derive_key_from_password(password)
-    cipher = AES.new(key, AES.MODE_GCM)
+    nonce = get_random_bytes(16)
     
-    # Encrypt and generate authentication tag
-    ciphertext, tag = cipher.encrypt_and_digest(plaintext.encode())
+    # Encrypt and generate authentication tag (AESGCM appends the 16-byte tag)
+    sealed = AESGCM(key).encrypt(nonce, plaintext.encode(), None)
+    ciphertext, tag = sealed[:-16], sealed[-16:]
     
     # Combine nonce (16 bytes) + tag (16 bytes) + ciphertext
-    encrypted_data = cipher.nonce + tag + ciphertext
+    encrypted_data = nonce + tag + ciphertext
     
     # Return as base64 for easy storage
     return base64.b64encode(encrypted_data).decode('utf-8')
@@ -100,9 +118,8 @@ def aes_gcm_decrypt_with_password(encrypted_data, password):
         ciphertext = data[32:]  # Rest is ciphertext
         
         # Decrypt and verify
-        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-        plaintext = cipher.decrypt_and_verify(ciphertext, tag)
+        plaintext = AESGCM(key).decrypt(nonce, ciphertext + tag, None)
         
         return plaintext.decode('utf-8')
-    except (ValueError, KeyError) as e:
+    except (ValueError, KeyError, InvalidTag) as e:
         raise Exception("Decryption failed: Invalid password or corrupted data")
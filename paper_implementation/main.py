@@ -1,6 +1,5 @@
 # main.py
 import sys
-import base64
 import os
 
 from AESCTR import aes_ctr_encrypt, aes_ctr_decrypt
@@ -15,26 +14,24 @@ def hide_message_in_image(input_image, output_image, secret_message):
     print("[*] Encrypting secret message with AES-CTR...")
     key, nonce, ciphertext = aes_ctr_encrypt(secret_message.encode())
     
-    # Convert nonce + ciphertext to Base64 string for LSB embedding
-    data_to_hide = base64.b64encode(nonce + ciphertext).decode('utf-8')
+    # nonce + ciphertext are embedded as raw bytes (LSB carries any byte)
+    data_to_hide = nonce + ciphertext
     
     print(f"[*] Embedding encrypted message into image: {input_image}")
     stego = SteganographyLSB()
-    stego.encode(input_image, output_image, data_to_hide, password="unused")
+    stego.encode_bytes(input_image, output_image, data_to_hide)
     
     print(f"[*] Message embedded in {output_image}")
     return key  # must keep key safe for decryption
 
 def extract_message_from_image(stego_image, key):
     """
-    Extract Base64 string from image, decode, then decrypt using AES-CTR.
+    Extract nonce + ciphertext bytes from image, then decrypt using AES-CTR.
     """
     print(f"[*] Extracting hidden data from image: {stego_image}")
     stego = SteganographyLSB()
-    data_extracted = stego.decode(stego_image, password="unused")
+    raw_bytes = stego.decode_bytes(stego_image)
     
-    # Decode Base64 to get nonce + ciphertext
-    raw_bytes = base64.b64decode(data_extracted)
     nonce = raw_bytes[:8]
     ciphertext = raw_bytes[8:]
     
@@ -1,11 +1,45 @@
+import hashlib
 import cv2
 import numpy as np
 import math
+from collections import OrderedDict
+
+# Decoded grayscale images keyed by a hash of the file bytes, so a file
+# rewritten in place (same size, same mtime tick) is never served stale pixels
+_GRAY_CACHE = OrderedDict()
+_GRAY_CACHE_SIZE = 8
+
+def _load_gray(path):
+    """
+    Load an image as grayscale, reusing the decoded array for files with
+    identical content; returns None if unreadable
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    image = _GRAY_CACHE.get(key)
+    if image is not None:
+        _GRAY_CACHE.move_to_end(key)
+        return image
+
+    # Decode the bytes already read for the hash
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return None
+    # Shared between callers, so guard against in-place modification
+    image.flags.writeable = False
+
+    _GRAY_CACHE[key] = image
+    if len(_GRAY_CACHE) > _GRAY_CACHE_SIZE:
+        _GRAY_CACHE.popitem(last=False)
+    return image
 
 def calculate_mse(original, stego):
-    original = original.astype(np.float64)
-    stego = stego.astype(np.float64)
-    mse = np.mean((original - stego) ** 2)
+    mse = cv2.norm(original, stego, cv2.NORM_L2SQR) / original.size
     return mse
 
 def calculate_psnr(original, stego):
@@ -17,8 +51,8 @@ def calculate_psnr(original, stego):
     return psnr
 
 def psnr_for_images(original_path, stego_path):
-    original = cv2.imread(original_path, cv2.IMREAD_GRAYSCALE)
-    stego = cv2.imread(stego_path, cv2.IMREAD_GRAYSCALE)
+    original = _load_gray(original_path)
+    stego = _load_gray(stego_path)
     
     if original is None:
         print(f"Error: Could not load original image {original_path}")
@@ -33,5 +67,6 @@ def psnr_for_images(original_path, stego_path):
     psnr_value = calculate_psnr(original, stego)
     print(f"PSNR between {original_path} and {stego_path}: {psnr_value:.4f} dB")
 
-psnr_for_images("media/tyla.jpg", "media/stego_image.png")
-psnr_for_images("media/burger.jpg", "media/stego_image_2.png")
+if __name__ == "__main__":
+    psnr_for_images("media/tyla.jpg", "media/stego_image.png")
+    psnr_for_images("media/burger.jpg", "media/stego_image_2.png")
@@ -13,11 +13,88 @@ Algorithm:
 
 import sys
 import os
+import math
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
 import cv2
 import numpy as np
 from PIL import Image
 from AESCTR import aes_gcm_encrypt_with_password, aes_gcm_decrypt_with_password
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; encode/decode then use NumPy gathers
+    njit = None
+
+
+# -------------------------
+# Compiled Embed/Extract Kernels
+# -------------------------
+if njit is not None:
+    @njit(cache=True)
+    def _embed_chars(flat, slots, char_codes):
+        """
+        Write char i (MSB first) and its continuation flag into the LSBs of
+        the 9 channel values of pixels slots[i] of flat (H*W, 3)
+        """
+        n = char_codes.shape[0]
+        for i in range(n):
+            for k in range(9):
+                p = slots[i, k // 3]
+                c = k % 3
+                if k < 8:
+                    bit = (char_codes[i] >> (7 - k)) & 1
+                else:
+                    bit = 1 if i < n - 1 else 0
+                flat[p, c] = (flat[p, c] & 0xFE) | bit
+
+    @njit(cache=True)
+    def _extract_chars(flat, slots, out):
+        """
+        Read char i from the LSBs of pixels slots[i] into out[i], stopping
+        after the first char whose continuation flag is 0
+        Returns the number of chars read
+        """
+        for i in range(out.shape[0]):
+            code = 0
+            for k in range(8):
+                code = (code << 1) | (flat[slots[i, k // 3], k % 3] & 1)
+            out[i] = code
+            if flat[slots[i, 2], 2] & 1 == 0:
+                return i + 1
+        return out.shape[0]
+else:
+    _embed_chars = None
+    _extract_chars = None
+
+# Set bits per byte value, for counting embeddable pixels in packed mask rows
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1, dtype=np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _check_opencv_parallel():
+    """
+    One-time check that OpenCV can split cvtColor/spatialGradient across
+    cores: parallel_for_ needs a parallel framework (TBB, OpenMP, pthreads)
+    in the build and more than one thread allowed. OpenCV already defaults
+    to one thread per core, so nothing is set here; the thread count stays
+    the caller's process-wide choice. Returns the framework name (or None)
+    """
+    framework = None
+    for line in cv2.getBuildInformation().splitlines():
+        if line.strip().startswith('Parallel framework:'):
+            framework = line.split(':', 1)[1].strip() or None
+            break
+
+    if framework is None:
+        print("[!] OpenCV was built without a parallel framework; the Sobel "
+              "pass runs single-threaded (install an opencv-python build with TBB or OpenMP)")
+    elif cv2.getNumThreads() <= 1 < (os.cpu_count() or 1):
+        print(f"[!] OpenCV ({framework}) is limited to one thread; "
+              "cv2.setNumThreads(-1) restores the default of one per core")
+    return framework
+
 
 class EdgeAdaptiveLSB:
     """
@@ -27,6 +104,26 @@ class EdgeAdaptiveLSB:
 
     def __init__(self):
         self.PIXELS_PER_CHAR = 3  # 3 pixels (9 channels) per character
+        self.COORD_ROW_CHUNK = 64  # Packed mask rows counted per step
+
+        # Edge map results keyed by file content, shared by
+        # get_capacity/encode/decode
+        self._edge_map_cache = OrderedDict()
+        self._edge_map_cache_size = 4
+
+        # Warn once per process if the edge-map pass cannot run multithreaded
+        _check_opencv_parallel()
+
+        # Scratch arrays for compute_sobel_gradient, reused across images of
+        # the same size (not thread-safe: use one instance per thread)
+        self._scratch = {}
+
+    def _buffer(self, name, shape, dtype):
+        """Scratch array called name, reallocated only when shape/dtype change"""
+        buf = self._scratch.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = self._scratch[name] = np.empty(shape, dtype=dtype)
+        return buf
 
     # -------------------------
     # Encryption Interface
@@ -47,7 +144,10 @@ class EdgeAdaptiveLSB:
     # -------------------------
     def compute_sobel_gradient(self, image_cv):
         """
-        Compute Sobel gradient magnitude for each pixel (Di).
+        Compute squared Sobel gradient magnitude for each pixel (Di^2).
+
+        Di itself is only needed averaged (Me), so the per-pixel sqrt is
+        skipped and the mask compares Di^2 against an integer threshold.
 
         IMPORTANT: We mask out the LSB before computing gradients to ensure
         encoder and decoder compute identical masks. LSB changes during
@@ -57,73 +157,180 @@ class EdgeAdaptiveLSB:
             image_cv: OpenCV BGR image array
 
         Returns:
-            2D numpy array of gradient magnitudes
+            2D int32 array of squared gradient magnitudes
         """
         # Mask out LSB from ALL RGB channels BEFORE grayscale conversion
         # This ensures encoder and decoder compute identical masks
         # (grayscale = 0.299*R + 0.587*G + 0.114*B, so RGB LSB changes affect gray)
-        image_stable = (image_cv & 0xFE).astype(np.uint8)
+        # One uint8 AND pass in OpenCV; the scalar is given per channel, since a
+        # bare number would only apply to the first (B) channel
+        # Intermediates go into preallocated scratch buffers; only the
+        # returned gradient_sq is a fresh array
+        height, width = image_cv.shape[:2]
+        image_stable = cv2.bitwise_and(image_cv, (0xFE, 0xFE, 0xFE, 0xFE),
+                                       dst=self._buffer('stable', image_cv.shape, np.uint8))
 
         # Convert to grayscale
-        gray = cv2.cvtColor(image_stable, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(image_stable, cv2.COLOR_BGR2GRAY,
+                            dst=self._buffer('gray', (height, width), np.uint8))
 
-        # Compute Sobel gradients in X and Y directions
-        sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-        sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+        # Compute Sobel gradients in X and Y directions in a single pass
+        # (int16 output, same values as two 3x3 cv2.Sobel calls)
+        sobel_x, sobel_y = cv2.spatialGradient(gray,
+                                               self._buffer('dx', (height, width), np.int16),
+                                               self._buffer('dy', (height, width), np.int16),
+                                               ksize=3)
 
-        # Compute gradient magnitude: Di = sqrt(Gx^2 + Gy^2)
-        gradient_magnitude = np.sqrt(sobel_x**2 + sobel_y**2)
+        # Squared gradient magnitude: Di^2 = Gx^2 + Gy^2 (max 2 * 1020^2, fits int32)
+        # Widen int16 -> int32 inside the ufuncs, accumulating in place
+        gradient_sq = np.square(sobel_x, dtype=np.int32)
+        gradient_sq += np.square(sobel_y, dtype=np.int32,
+                                 out=self._buffer('dy_sq', (height, width), np.int32))
 
-        return gradient_magnitude
+        return gradient_sq
 
-    def compute_mean_gradient(self, gradient_map):
+    def compute_mean_gradient(self, gradient_sq):
         """
         Compute mean gradient (Me) across the entire image.
 
         Args:
-            gradient_map: 2D array of gradient magnitudes
+            gradient_sq: 2D array of squared gradient magnitudes (Di^2)
 
         Returns:
             Mean gradient value (Me)
         """
-        return np.mean(gradient_map)
+        # float32 sqrt halves the bytes of the temporary; the sum is still
+        # accumulated in float64
+        roots = np.sqrt(gradient_sq, dtype=np.float32)
+        return float(np.add.reduce(roots, axis=None, dtype=np.float64) / gradient_sq.size)
 
     # -------------------------
     # P2.2: Embedding Condition
     # -------------------------
-    def generate_embeddable_mask(self, gradient_map, mean_gradient):
+    def generate_embeddable_mask(self, gradient_sq, mean_gradient):
         """
         Generate boolean mask where True indicates embeddable pixels.
         Condition: Di <= Me (embed in smooth regions only)
 
+        Evaluated as Di^2 <= q, q being the largest integer whose sqrt is
+        <= Me, which selects exactly the same pixels as sqrt(Di^2) <= Me.
+
         Args:
-            gradient_map: 2D array of gradient magnitudes (Di)
+            gradient_sq: 2D array of squared gradient magnitudes (Di^2)
             mean_gradient: Mean gradient value (Me)
 
         Returns:
             Boolean mask array
         """
-        return gradient_map <= mean_gradient
+        return gradient_sq <= self._squared_threshold(mean_gradient)
 
-    def get_embeddable_pixel_coords(self, mask, width, height):
+    def _squared_threshold(self, mean_gradient):
+        """
+        Largest integer q with sqrt(q) <= Me (-1 if there is none).
+        """
+        q = int(mean_gradient * mean_gradient)
+        while math.sqrt(q + 1) <= mean_gradient:
+            q += 1
+        while q >= 0 and math.sqrt(q) > mean_gradient:
+            q -= 1
+        return q
+
+    def get_embeddable_pixel_coords(self, mask_bits, width, height, limit=None):
         """
         Extract coordinates of embeddable pixels in deterministic row-major order.
         This order must be identical for encoder and decoder.
 
         Args:
-            mask: Boolean embeddable mask
+            mask_bits: Embeddable mask, bit-packed along rows (see get_edge_map)
             width: Image width
             height: Image height
+            limit: Return only the first limit coordinates (None = all)
+
+        Returns:
+            (K, 2) int32 array of (x, y) coordinates for embeddable pixels
+        """
+        mask_bits = mask_bits[:height]
+        end = mask_bits.shape[0]
+        if limit is not None:
+            # Count set bits on the packed rows, a chunk at a time, and stop
+            # at the row where the running count reaches limit; only rows up
+            # to there are ever unpacked
+            end = 0
+            total = 0
+            while end < mask_bits.shape[0]:
+                chunk = mask_bits[end:end + self.COORD_ROW_CHUNK]
+                row_ends = np.cumsum(_POPCOUNT[chunk].sum(axis=1))
+                hit = int(np.searchsorted(row_ends, limit - total))
+                if hit < chunk.shape[0]:
+                    end += hit + 1
+                    break
+                total += int(row_ends[-1])
+                end += chunk.shape[0]
+
+        # np.nonzero scans the mask in C, already in row-major (y, then x) order
+        ys, xs = np.nonzero(self.unpack_mask(mask_bits[:end], width))
+        return np.column_stack((xs, ys))[:limit].astype(np.int32)
+
+    def get_edge_map(self, image_path):
+        """
+        Run P2.1 + P2.2 on an image file, reusing the result for files with
+        identical content (keyed by a hash of the file bytes, so a file
+        rewritten in place is never served a stale map).
+
+        Args:
+            image_path: Path to image file
 
         Returns:
-            List of (x, y) tuples for embeddable pixels
+            Tuple (mean_gradient, mask_bits, embeddable_count), where
+            mask_bits is the embeddable mask bit-packed along rows
+            (see unpack_mask); the array is shared between calls and read-only
+        """
+        try:
+            with open(image_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            raise FileNotFoundError(f"Could not load image: {image_path}")
+
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        edge_map = self._edge_map_cache.get(key)
+        if edge_map is not None:
+            self._edge_map_cache.move_to_end(key)
+            return edge_map
+
+        # Decode the bytes already read for the hash
+        image_cv = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image_cv is None:
+            raise FileNotFoundError(f"Could not load image: {image_path}")
+        edge_map = self._compute_edge_map(image_cv)
+
+        self._edge_map_cache[key] = edge_map
+        if len(self._edge_map_cache) > self._edge_map_cache_size:
+            self._edge_map_cache.popitem(last=False)
+        return edge_map
+
+    def _compute_edge_map(self, image_cv):
         """
-        coords = []
-        for y in range(height):
-            for x in range(width):
-                if mask[y, x]:
-                    coords.append((x, y))
-        return coords
+        Run P2.1 + P2.2 on a decoded BGR image.
+
+        Returns:
+            Tuple (mean_gradient, mask_bits, embeddable_count): Me, the
+            embeddable mask bit-packed along rows (read-only) and its number
+            of embeddable pixels
+        """
+        gradient_sq = self.compute_sobel_gradient(image_cv)
+        mean_gradient = self.compute_mean_gradient(gradient_sq)
+        mask = self.generate_embeddable_mask(gradient_sq, mean_gradient)
+        embeddable_count = int(np.count_nonzero(mask))
+
+        # Keep the mask at 1 bit/pixel so cached entries stay small
+        mask_bits = np.packbits(mask, axis=1)
+
+        mask_bits.flags.writeable = False
+        return mean_gradient, mask_bits, embeddable_count
+
+    def unpack_mask(self, mask_bits, width):
+        """Boolean embeddable mask from the row bit-packed form of get_edge_map"""
+        return np.unpackbits(mask_bits, axis=1, count=width).view(bool)
 
     # -------------------------
     # Utility Methods
@@ -138,18 +345,10 @@ class EdgeAdaptiveLSB:
         Returns:
             Dictionary with capacity information
         """
-        image_cv = cv2.imread(image_path)
-        if image_cv is None:
-            raise FileNotFoundError(f"Could not load image: {image_path}")
-
-        height, width = image_cv.shape[:2]
-
-        # Compute gradient and mask
-        gradient_map = self.compute_sobel_gradient(image_cv)
-        mean_gradient = self.compute_mean_gradient(gradient_map)
-        mask = self.generate_embeddable_mask(gradient_map, mean_gradient)
+        mean_gradient, _, embeddable_count = self.get_edge_map(image_path)
+        with Image.open(image_path) as image:  # reads the header only
+            width, height = image.size
 
-        embeddable_count = np.sum(mask)
         total_pixels = width * height
         char_capacity = embeddable_count // self.PIXELS_PER_CHAR
 
@@ -161,16 +360,16 @@ class EdgeAdaptiveLSB:
             'mean_gradient': mean_gradient
         }
 
-    def save_edge_map(self, gradient_map, output_path):
+    def save_edge_map(self, gradient_sq, output_path):
         """
         Save gradient map as visualization image.
 
         Args:
-            gradient_map: 2D array of gradient magnitudes
+            gradient_sq: 2D array of squared gradient magnitudes
             output_path: Path to save visualization
         """
-        # Normalize to 0-255 for visualization
-        normalized = cv2.normalize(gradient_map, None, 0, 255, cv2.NORM_MINMAX)
+        # Normalize magnitudes (Di) to 0-255 for visualization
+        normalized = cv2.normalize(np.sqrt(gradient_sq), None, 0, 255, cv2.NORM_MINMAX)
         cv2.imwrite(output_path, normalized.astype(np.uint8))
 
     # -------------------------
@@ -194,84 +393,67 @@ class EdgeAdaptiveLSB:
         """
         print(f"[*] Loading image: {image_path}")
 
-        # Load image with both PIL (for pixel manipulation) and OpenCV (for Sobel)
+        # Load image with PIL (for pixel manipulation); the Sobel pass reads
+        # it with OpenCV inside get_edge_map
         image_pil = Image.open(image_path)
         if image_pil.mode != 'RGB':
             image_pil = image_pil.convert('RGB')
 
-        image_cv = cv2.imread(image_path)
-        if image_cv is None:
-            raise FileNotFoundError(f"Could not load image: {image_path}")
-
         width, height = image_pil.size
-        pixels = image_pil.load()
 
         # Step 1: Encrypt the secret message
         print("[*] Encrypting text...")
         cipher_text = self.encrypt_message(secret_text, password)
         print(f"[*] Ciphertext length: {len(cipher_text)} chars")
 
-        # Step 2: Compute Sobel gradient map (P2.1)
+        # Step 2 + 3: Compute Sobel gradient map (P2.1) and embeddable mask (P2.2)
         print("[*] Computing edge map (Sobel gradient)...")
-        gradient_map = self.compute_sobel_gradient(image_cv)
-        mean_gradient = self.compute_mean_gradient(gradient_map)
+        mean_gradient, mask_bits, embeddable_count = self.get_edge_map(image_path)
         print(f"[*] Mean gradient (Me): {mean_gradient:.2f}")
-
-        # Step 3: Generate embeddable mask (P2.2)
-        mask = self.generate_embeddable_mask(gradient_map, mean_gradient)
-        embeddable_coords = self.get_embeddable_pixel_coords(mask, width, height)
-        print(f"[*] Embeddable pixels: {len(embeddable_coords)} / {width * height} ({len(embeddable_coords) / (width * height) * 100:.1f}%)")
+        print(f"[*] Embeddable pixels: {embeddable_count} / {width * height} ({embeddable_count / (width * height) * 100:.1f}%)")
 
         # Step 4: Check capacity
         required_pixels = len(cipher_text) * self.PIXELS_PER_CHAR
-        if required_pixels > len(embeddable_coords):
+        if required_pixels > embeddable_count:
             raise ValueError(
                 f"[-] Insufficient capacity. Need {required_pixels} pixels, "
-                f"have {len(embeddable_coords)} embeddable pixels. "
-                f"Max message length: {len(embeddable_coords) // self.PIXELS_PER_CHAR} chars"
+                f"have {embeddable_count} embeddable pixels. "
+                f"Max message length: {embeddable_count // self.PIXELS_PER_CHAR} chars"
             )
 
+        # Only the first required_pixels embeddable pixels are written
+        embeddable_coords = self.get_embeddable_pixel_coords(mask_bits, width, height, limit=required_pixels)
+
         # Step 5: Embed data using edge-adaptive pixel selection (P2.3 + P2.4)
         print("[*] Embedding data in smooth regions...")
-        coord_idx = 0
         total_chars = len(cipher_text)
 
-        for i in range(total_chars):
-            char = cipher_text[i]
-            binary_char = f'{ord(char):08b}'
-
-            # Get 3 consecutive embeddable pixel coordinates
-            p1_coord = embeddable_coords[coord_idx]
-            p2_coord = embeddable_coords[coord_idx + 1]
-            p3_coord = embeddable_coords[coord_idx + 2]
-            coord_idx += 3
-
-            # Get pixel values
-            p1 = pixels[p1_coord]
-            p2 = pixels[p2_coord]
-            p3 = pixels[p3_coord]
-
-            # Combine into 9 channel values
-            nine_vals = list(p1) + list(p2) + list(p3)
-
-            # Embed 8 bits of character into LSB of first 8 values
-            for bit_index in range(8):
-                current_val = nine_vals[bit_index]
-                bin_val = list(f'{current_val:08b}')
-                bin_val[-1] = binary_char[bit_index]
-                nine_vals[bit_index] = int("".join(bin_val), 2)
+        # Work on one (H*W, 3) pixel array; character i uses the 3 consecutive
+        # embeddable pixels slots[i], i.e. 9 channel values
+        arr = np.array(image_pil, dtype=np.uint8)
+        flat = arr.reshape(-1, 3)
+        slots = (embeddable_coords[:, 1] * width + embeddable_coords[:, 0]).reshape(total_chars, 3)
+        # Char codes in one C-level conversion (base64 ciphertext is ASCII)
+        if isinstance(cipher_text, str):
+            cipher_text = cipher_text.encode('latin-1')
+        char_codes = np.frombuffer(cipher_text, dtype=np.uint8)
+
+        if _embed_chars is not None:
+            _embed_chars(flat, slots, char_codes)
+        else:
+            nine_vals = flat[slots].reshape(total_chars, 9)
+
+            # Embed 8 bits of each character (MSB first) into LSB of first 8 values
+            bits = np.unpackbits(char_codes).reshape(total_chars, 8)
+            nine_vals[:, :8] = (nine_vals[:, :8] & 0xFE) | bits
 
             # Embed continuation flag in 9th LSB (1 = more data, 0 = end)
-            has_more = 1 if i < (total_chars - 1) else 0
-            last_val = nine_vals[8]
-            bin_last = list(f'{last_val:08b}')
-            bin_last[-1] = str(has_more)
-            nine_vals[8] = int("".join(bin_last), 2)
+            has_more = np.ones(total_chars, dtype=np.uint8)
+            has_more[-1] = 0
+            nine_vals[:, 8] = (nine_vals[:, 8] & 0xFE) | has_more
 
             # Write back modified pixels
-            pixels[p1_coord] = tuple(nine_vals[0:3])
-            pixels[p2_coord] = tuple(nine_vals[3:6])
-            pixels[p3_coord] = tuple(nine_vals[6:9])
+            flat[slots] = nine_vals.reshape(total_chars, 3, 3)
 
         # Step 6: Save stego image
         output_dir = os.path.dirname(output_path)
@@ -280,14 +462,17 @@ class EdgeAdaptiveLSB:
             print(f"[*] Created directory: {output_dir}")
 
         print(f"[*] Encoding successful. Saving to {output_path}")
-        image_pil.save(output_path, 'PNG')
+        # Deflate level 1: much cheaper than PIL's default of 6, still lossless.
+        # The new Image has no info, so carry the cover's ICC profile and DPI
+        metadata = {k: image_pil.info[k] for k in ('icc_profile', 'dpi') if k in image_pil.info}
+        Image.fromarray(arr, 'RGB').save(output_path, 'PNG', compress_level=1, **metadata)
 
         return {
             'mean_gradient': mean_gradient,
             'total_pixels': width * height,
-            'embeddable_pixels': len(embeddable_coords),
+            'embeddable_pixels': embeddable_count,
             'used_pixels': required_pixels,
-            'capacity_chars': len(embeddable_coords) // self.PIXELS_PER_CHAR,
+            'capacity_chars': embeddable_count // self.PIXELS_PER_CHAR,
             'message_chars': total_chars
         }
 
@@ -309,65 +494,48 @@ class EdgeAdaptiveLSB:
         """
         print(f"[*] Scanning image: {image_path}")
 
-        # Load image with both PIL and OpenCV
         image_pil = Image.open(image_path)
-        image_cv = cv2.imread(image_path)
-
-        if image_cv is None:
-            raise FileNotFoundError(f"Could not load image: {image_path}")
+        if image_pil.mode != 'RGB':
+            image_pil = image_pil.convert('RGB')
 
         width, height = image_pil.size
-        pixels = image_pil.load()
 
         # Recompute the SAME embeddable mask (critical for decoder sync)
         print("[*] Recomputing edge map for pixel selection...")
-        gradient_map = self.compute_sobel_gradient(image_cv)
-        mean_gradient = self.compute_mean_gradient(gradient_map)
-        mask = self.generate_embeddable_mask(gradient_map, mean_gradient)
-        embeddable_coords = self.get_embeddable_pixel_coords(mask, width, height)
-
-        print(f"[*] Found {len(embeddable_coords)} embeddable pixels")
-
-        # Extract hidden data
-        cipher_text = ""
-        coord_idx = 0
-
-        while coord_idx + 3 <= len(embeddable_coords):
-            # Get 3 consecutive embeddable pixel coordinates
-            p1_coord = embeddable_coords[coord_idx]
-            p2_coord = embeddable_coords[coord_idx + 1]
-            p3_coord = embeddable_coords[coord_idx + 2]
-            coord_idx += 3
-
-            # Get pixel values
-            p1 = pixels[p1_coord]
-            p2 = pixels[p2_coord]
-            p3 = pixels[p3_coord]
-
-            # Combine into 9 channel values
-            nine_vals = list(p1) + list(p2) + list(p3)
-
-            # Extract 8 bits of character from LSBs
-            char_bits = ""
-            for i in range(8):
-                val = nine_vals[i]
-                char_bits += f'{val:08b}'[-1]
-
-            char_code = int(char_bits, 2)
-            cipher_text += chr(char_code)
-
-            # Check continuation flag
-            flag_val = nine_vals[8]
-            flag_bit = f'{flag_val:08b}'[-1]
-
-            if flag_bit == '0':
-                break
-
-        print(f"[*] Extraction complete. Ciphertext length: {len(cipher_text)}")
-
-        # Decrypt the extracted ciphertext
+        mean_gradient, mask_bits, embeddable_count = self.get_edge_map(image_path)
+
+        print(f"[*] Found {embeddable_count} embeddable pixels")
+
+        # Gather the LSBs of every complete 9-value group of embeddable pixels
+        max_chars = embeddable_count // self.PIXELS_PER_CHAR
+        n_slots = max_chars * self.PIXELS_PER_CHAR
+        embeddable_coords = self.get_embeddable_pixel_coords(mask_bits, width, height, limit=n_slots)
+        flat = np.asarray(image_pil, dtype=np.uint8).reshape(-1, 3)
+        slots = (embeddable_coords[:, 1] * width + embeddable_coords[:, 0]).reshape(max_chars, 3)
+
+        if _extract_chars is not None:
+            char_codes = np.empty(max_chars, dtype=np.uint8)
+            n_chars = _extract_chars(flat, slots, char_codes)
+            cipher_bytes = char_codes[:n_chars].tobytes()
+        else:
+            lsbs = flat[slots].reshape(max_chars, 9) & 1
+
+            # The first char with continuation flag 0 is the last one;
+            # without any, every group is read
+            n_chars = max_chars
+            if max_chars:
+                end = int(np.argmin(lsbs[:, 8]))
+                if lsbs[end, 8] == 0:
+                    n_chars = end + 1
+
+            # Rebuild each character from its 8 LSBs (MSB first)
+            cipher_bytes = np.packbits(lsbs[:n_chars, :8], axis=1).tobytes()
+
+        print(f"[*] Extraction complete. Ciphertext length: {len(cipher_bytes)}")
+
+        # Decrypt the extracted ciphertext (base64 bytes decode directly)
         print("[*] Decrypting...")
-        plain_text = self.decrypt_message(cipher_text, password)
+        plain_text = self.decrypt_message(cipher_bytes, password)
         return plain_text
 
 
@@ -10,11 +10,224 @@ Includes:
 These attacks help evaluate the robustness of steganographic methods.
 """
 
+import hashlib
+import threading
 import numpy as np
 import cv2
-from typing import Tuple, Dict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Tuple, Dict, Union
 import matplotlib.pyplot as plt
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; RS analysis then runs vectorized in NumPy
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _rs_counts(pixels, mask_size):
+        """
+        Count (RM, SM, RN, SN) over the consecutive mask_size-pixel groups of
+        pixels in one pass: positive mask flips every LSB, negative mask the
+        LSBs of even-indexed pixels
+        """
+        RM = 0
+        SM = 0
+        RN = 0
+        SN = 0
+        for g in prange(pixels.shape[0] // mask_size):
+            start = g * mask_size
+            f = 0
+            f_pos = 0
+            f_neg = 0
+            for k in range(mask_size - 1):
+                a = np.int16(pixels[start + k])
+                b = np.int16(pixels[start + k + 1])
+                f += abs(b - a)
+                f_pos += abs((b ^ 1) - (a ^ 1))
+                if k % 2 == 0:
+                    f_neg += abs(b - (a ^ 1))
+                else:
+                    f_neg += abs((b ^ 1) - a)
+            if f_pos < f:
+                RM += 1
+            elif f_pos > f:
+                SM += 1
+            if f_neg < f:
+                RN += 1
+            elif f_neg > f:
+                SN += 1
+        return RM, SM, RN, SN
+else:
+    _rs_counts = None
+
+
+def _hist_metrics(hist_cover, hist_stego):
+    """
+    Chi-square distance, Kolmogorov-Smirnov statistic and Bhattacharyya
+    distance between two normalized histograms, in one pass over the bins
+    """
+    chi_square = 0.0
+    ks_statistic = 0.0
+    bc = 0.0
+    cum_cover = 0.0
+    cum_stego = 0.0
+    for i in range(hist_cover.shape[0]):
+        c = hist_cover[i]
+        s = hist_stego[i]
+        chi_square += (c - s) ** 2 / (c + s + 1e-10)
+        cum_cover += c
+        cum_stego += s
+        ks_statistic = max(ks_statistic, abs(cum_cover - cum_stego))
+        bc += np.sqrt(c * s)
+    return chi_square, ks_statistic, -np.log(bc + 1e-10)
+
+
+if njit is not None:
+    _hist_metrics = njit(cache=True)(_hist_metrics)
+else:
+    def _hist_metrics(hist_cover, hist_stego):
+        """
+        Same metrics without Numba via OpenCV's native compareHist (float32
+        only). HISTCMP_CHISQR_ALT is twice our symmetric chi-square, and
+        HISTCMP_BHATTACHARYYA returns sqrt(1 - BC) for normalized histograms
+        """
+        cover32 = hist_cover.astype(np.float32)
+        stego32 = hist_stego.astype(np.float32)
+        chi_square = cv2.compareHist(cover32, stego32, cv2.HISTCMP_CHISQR_ALT) / 2
+        hellinger = cv2.compareHist(cover32, stego32, cv2.HISTCMP_BHATTACHARYYA)
+        ks_statistic = np.max(np.abs(np.cumsum(hist_cover) - np.cumsum(hist_stego)))
+        return chi_square, float(ks_statistic), -np.log(1.0 - hellinger ** 2 + 1e-10)
+
+
+def _calc_hist256(image):
+    """
+    256-bin integer histogram of a uint8 image (any shape) via OpenCV's
+    vectorized calcHist; float32 bins stay exact below 2**24 pixels, so
+    larger inputs fall back to np.bincount
+    """
+    if image.size >= 1 << 24:
+        return np.bincount(image.ravel(), minlength=256)
+    hist = cv2.calcHist([image.reshape(1, -1)], [0], None, [256], [0, 256])
+    return hist.ravel().astype(np.int64)
+
+
+# cv2.imread flags per decode_scale: the codec downscales while decoding
+# (JPEG via IDCT scaling), so less pixel data is produced in the first place
+_GRAYSCALE_READ_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+
+# Decoded images (and, once requested, their histograms) keyed by a hash of
+# the file bytes and decode_scale, so a file rewritten in place is never
+# served stale pixels; the lock keeps the LRU consistent for the worker
+# threads of comprehensive_steganalysis
+_IMAGE_CACHE = OrderedDict()
+_IMAGE_CACHE_SIZE = 8
+_IMAGE_CACHE_LOCK = threading.Lock()
+
+
+def _load_entry(path, decode_scale=1):
+    """
+    Cached (image, hist) namespace for a file, hist filled in lazily by
+    _load_stats; returns None if unreadable
+    """
+    if decode_scale not in _GRAYSCALE_READ_FLAGS:
+        raise ValueError(f"decode_scale must be one of {sorted(_GRAYSCALE_READ_FLAGS)}")
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    
+    key = (hashlib.blake2b(data, digest_size=16).digest(), decode_scale)
+    with _IMAGE_CACHE_LOCK:
+        entry = _IMAGE_CACHE.get(key)
+        if entry is not None:
+            _IMAGE_CACHE.move_to_end(key)
+            return entry
+    
+    # Decode the bytes already read for the hash
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), _GRAYSCALE_READ_FLAGS[decode_scale])
+    if image is None:
+        return None
+    # Shared between callers, so guard against in-place modification
+    image.flags.writeable = False
+    
+    with _IMAGE_CACHE_LOCK:
+        entry = _IMAGE_CACHE.setdefault(key, SimpleNamespace(image=image, hist=None))
+        _IMAGE_CACHE.move_to_end(key)
+        if len(_IMAGE_CACHE) > _IMAGE_CACHE_SIZE:
+            _IMAGE_CACHE.popitem(last=False)
+    return entry
+
+
+def _load_gray(path, decode_scale=1):
+    """
+    Load an image as grayscale, downscaled by decode_scale (1, 2, 4 or 8),
+    reusing the decoded array for files with identical content; returns None
+    if unreadable
+    """
+    entry = _load_entry(path, decode_scale)
+    return None if entry is None else entry.image
+
+
+def _load_stats(path, decode_scale=1):
+    """
+    Grayscale image and its 256-bin histogram as a namespace (image, hist),
+    cached like _load_gray so attacks on the same file bin it only once;
+    returns None if unreadable
+    """
+    entry = _load_entry(path, decode_scale)
+    if entry is None:
+        return None
+    if entry.hist is None:
+        hist = _calc_hist256(entry.image)
+        hist.flags.writeable = False
+        entry.hist = hist
+    return entry
+
+
+def _coerce(image, decode_scale=1):
+    """
+    Grayscale array for an attack input: a path (decoded via _load_gray), the
+    (image, hist) stats of _load_stats, or an already decoded grayscale/BGR
+    array, used as is (decode_scale only applies to paths). BGR arrays go
+    through cvtColor, which can round a few pixels differently from
+    cv2.imread's own grayscale decode
+    """
+    if isinstance(image, SimpleNamespace):
+        return image.image
+    if isinstance(image, np.ndarray):
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    gray = _load_gray(image, decode_scale)
+    if gray is None:
+        raise ValueError(f"Cannot load image: {image}")
+    return gray
+
+
+def _coerce_stats(image, decode_scale=1):
+    """
+    Like _coerce, but returns the (image, hist) namespace of _load_stats;
+    stats passed in are returned as is, so their histogram is reused
+    """
+    if isinstance(image, SimpleNamespace):
+        return image
+    if isinstance(image, np.ndarray):
+        gray = _coerce(image)
+        return SimpleNamespace(image=gray, hist=_calc_hist256(gray))
+    stats = _load_stats(image, decode_scale)
+    if stats is None:
+        raise ValueError(f"Cannot load image: {image}")
+    return stats
+
 
 class RSAnalysis:
     """
@@ -24,100 +237,111 @@ class RSAnalysis:
     between adjacent pixels. It measures how many pixel groups become
     'Regular' or 'Singular' after applying a mask function.
     """
-    
-    def __init__(self, mask_size=2):
+
+    # Groups per NumPy-fallback chunk: keeps the (2, chunk, mask_size) masked
+    # copies and smoothness arrays within L2 for typical mask sizes
+    CHUNK_GROUPS = 1 << 14
+
+    def __init__(self, mask_size=2, max_groups=1 << 20):
         """
         Args:
             mask_size: Size of pixel groups (typically 2 or 4)
+            max_groups: Analyze at most this many groups, evenly strided over
+                the image (None = all). RS statistics are group ratios, so
+                they and the detection threshold hold for a sample
         """
         self.mask_size = mask_size
-        
-    def _flip_lsb(self, pixels):
-        """Flip LSB of pixels"""
-        return pixels ^ 1
+        self.max_groups = max_groups
+        # Masks as XOR patterns, row 0 positive (flip every LSB), row 1
+        # negative (flip LSB of even-indexed pixels only)
+        self._mask_xors = np.stack([
+            np.ones(mask_size, dtype=np.uint8),
+            (np.arange(mask_size) % 2 == 0).astype(np.uint8),
+        ])
+        
+    def _apply_masks(self, groups):
+        """Apply positive and negative masks in one broadcast XOR: (2, N, mask_size)"""
+        return groups[np.newaxis] ^ self._mask_xors[:, np.newaxis]
     
-    def _apply_mask_positive(self, group):
-        """Apply positive mask: flip LSB of all pixels"""
-        return self._flip_lsb(group)
-    
-    def _apply_mask_negative(self, group):
-        """Apply negative mask: flip LSB of even-indexed pixels only"""
-        result = group.copy()
-        result[::2] = self._flip_lsb(result[::2])
-        return result
-    
-    def _calculate_smoothness(self, group):
+    def _calculate_smoothness(self, groups):
         """
-        Calculate smoothness (variation) of a pixel group
+        Calculate smoothness (variation) of each pixel group (one per row)
         Lower variation = smoother = Regular
         Higher variation = rougher = Singular
         """
-        if len(group) < 2:
-            return 0
-        variation = np.sum(np.abs(np.diff(group.astype(np.int32))))
-        return variation
+        # Pixel differences fit in int16; so does their sum for up to 129 pixels
+        dtype = np.int16 if groups.shape[-1] <= 129 else np.int32
+        # Subtract straight into int16 (the ufunc casts uint8 inputs on the
+        # fly, so no widened copy of the groups) and take abs in place
+        if groups.shape[-1] == 2:
+            # Common case: a single difference, no sum pass
+            diffs = np.subtract(groups[..., 1], groups[..., 0], dtype=np.int16)
+            return np.abs(diffs, out=diffs)
+        diffs = np.subtract(groups[..., 1:], groups[..., :-1], dtype=np.int16)
+        np.abs(diffs, out=diffs)
+        return np.sum(diffs, axis=-1, dtype=dtype)
     
-    def _classify_group(self, group, masked_group):
+    def _classify_group(self, f_original, masked_groups):
         """
-        Classify group as Regular or Singular
+        Count Regular and Singular groups per mask, given the smoothness of
+        the unmasked groups; returns (regular, singular), one count per mask
         Regular: smoothness decreases after masking
         Singular: smoothness increases after masking
+        Unusable (smoothness unchanged) groups are the remainder
         """
-        f_original = self._calculate_smoothness(group)
-        f_masked = self._calculate_smoothness(masked_group)
-        
-        if f_masked > f_original:
-            return 'S'  # Singular
-        elif f_masked < f_original:
-            return 'R'  # Regular
-        else:
-            return 'U'  # Unusable
+        f_masked = self._calculate_smoothness(masked_groups)
+        regular = np.count_nonzero(f_masked < f_original, axis=-1)
+        singular = np.count_nonzero(f_masked > f_original, axis=-1)
+        return regular, singular
     
-    def analyze(self, image_path: str) -> Dict:
+    def analyze(self, image: Union[str, np.ndarray], decode_scale: int = 1) -> Dict:
         """
         Perform RS analysis on an image
         
+        Args:
+            image: Path to test image, or the image already decoded
+                (grayscale or BGR array, or the stats from _load_stats)
+            decode_scale: Decode at 1/decode_scale resolution (1, 2, 4, 8);
+                faster, but downscaling averages away part of the LSB signal
+        
         Returns:
             Dict with RM, SM, RN, SN values and estimated embedding rate
         """
         # Load image
-        image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-        if image is None:
-            raise ValueError(f"Cannot load image: {image_path}")
+        image = _coerce(image, decode_scale)
         
         h, w = image.shape
-        pixels = image.flatten()
-        
-        # Counters
-        RM = 0  # Regular groups with positive mask
-        SM = 0  # Singular groups with positive mask
-        RN = 0  # Regular groups with negative mask
-        SN = 0  # Singular groups with negative mask
-        total_groups = 0
-        
-        # Process pixel groups
-        for i in range(0, len(pixels) - self.mask_size + 1, self.mask_size):
-            group = pixels[i:i+self.mask_size]
-            
-            # Apply positive mask
-            masked_pos = self._apply_mask_positive(group)
-            classification_pos = self._classify_group(group, masked_pos)
-            
-            if classification_pos == 'R':
-                RM += 1
-            elif classification_pos == 'S':
-                SM += 1
-            
-            # Apply negative mask
-            masked_neg = self._apply_mask_negative(group)
-            classification_neg = self._classify_group(group, masked_neg)
-            
-            if classification_neg == 'R':
-                RN += 1
-            elif classification_neg == 'S':
-                SN += 1
-            
-            total_groups += 1
+        pixels = image.ravel()
+        
+        # Consecutive non-overlapping pixel groups (a trailing partial group
+        # is ignored)
+        total_groups = len(pixels) // self.mask_size
+        
+        # Large images: keep every stride-th whole group (pixels within a
+        # group stay adjacent)
+        if self.max_groups and total_groups > self.max_groups:
+            stride = -(-total_groups // self.max_groups)
+            groups = pixels[:total_groups * self.mask_size].reshape(total_groups, self.mask_size)
+            pixels = np.ascontiguousarray(groups[::stride]).ravel()
+            total_groups = len(pixels) // self.mask_size
+        
+        if _rs_counts is not None:
+            RM, SM, RN, SN = (int(c) for c in _rs_counts(pixels, self.mask_size))
+        else:
+            # One group per row, processed in cache-sized chunks of groups so
+            # the masked/smoothness temporaries stay hot
+            groups = pixels[:total_groups * self.mask_size].reshape(total_groups, self.mask_size)
+            RM = SM = RN = SN = 0
+            for start in range(0, total_groups, self.CHUNK_GROUPS):
+                chunk = groups[start:start + self.CHUNK_GROUPS]
+                f_original = self._calculate_smoothness(chunk)
+                
+                # Apply positive and negative masks
+                (reg_pos, reg_neg), (sing_pos, sing_neg) = self._classify_group(f_original, self._apply_masks(chunk))
+                RM += int(reg_pos)   # Regular groups with positive mask
+                SM += int(sing_pos)  # Singular groups with positive mask
+                RN += int(reg_neg)   # Regular groups with negative mask
+                SN += int(sing_neg)  # Singular groups with negative mask
         
         # Normalize
         RM_norm = RM / total_groups if total_groups > 0 else 0
@@ -161,32 +385,25 @@ class HistogramAnalysis:
     LSB embedding creates characteristic histogram patterns.
     """
     
-    def analyze(self, cover_path: str, stego_path: str) -> Dict:
+    def analyze(self, cover: Union[str, np.ndarray], stego: Union[str, np.ndarray],
+                decode_scale: int = 1) -> Dict:
         """
-        Compare histograms of cover and stego images
+        Compare histograms of cover and stego images, given as paths, decoded
+        arrays or _load_stats stats (whose histograms are reused)
+        (decode_scale: decode at 1/decode_scale resolution, see RSAnalysis)
         """
-        cover = cv2.imread(cover_path, cv2.IMREAD_GRAYSCALE)
-        stego = cv2.imread(stego_path, cv2.IMREAD_GRAYSCALE)
-        
-        if cover is None or stego is None:
-            raise ValueError("Cannot load images")
-        
-        # Calculate histograms
-        hist_cover, _ = np.histogram(cover.flatten(), bins=256, range=(0, 256))
-        hist_stego, _ = np.histogram(stego.flatten(), bins=256, range=(0, 256))
+        # Histograms (for paths, computed once per file and shared with
+        # other attacks)
+        hist_cover = _coerce_stats(cover, decode_scale).hist
+        hist_stego = _coerce_stats(stego, decode_scale).hist
         
         # Normalize
         hist_cover = hist_cover.astype(np.float64) / hist_cover.sum()
         hist_stego = hist_stego.astype(np.float64) / hist_stego.sum()
         
-        # Chi-square distance
-        chi_square = np.sum((hist_cover - hist_stego) ** 2 / (hist_cover + hist_stego + 1e-10))
-        
-        # Kolmogorov-Smirnov statistic
-        ks_statistic = np.max(np.abs(np.cumsum(hist_cover) - np.cumsum(hist_stego)))
-        
-        # Bhattacharyya distance
-        bhattacharyya = -np.log(np.sum(np.sqrt(hist_cover * hist_stego)) + 1e-10)
+        # Chi-square distance, Kolmogorov-Smirnov statistic and
+        # Bhattacharyya distance in one fused pass
+        chi_square, ks_statistic, bhattacharyya = _hist_metrics(hist_cover, hist_stego)
         
         # Detection threshold (empirical)
         is_detectable = chi_square > 0.01 or ks_statistic > 0.05
@@ -201,38 +418,43 @@ class HistogramAnalysis:
     def visualize(self, cover_path: str, stego_path: str, output_path: str = None):
         """
         Visualize histogram comparison
+        (reuses the images and histograms computed by analyze while the files
+        are unchanged)
         """
-        cover = cv2.imread(cover_path, cv2.IMREAD_GRAYSCALE)
-        stego = cv2.imread(stego_path, cv2.IMREAD_GRAYSCALE)
+        cover = _load_stats(cover_path)
+        stego = _load_stats(stego_path)
+        bins = np.arange(256)
         
-        fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+        # Saved figures are trimmed by savefig(bbox_inches='tight') as part of
+        # the final render; interactive ones lay out at draw time instead of
+        # an upfront tight_layout render
+        fig, axes = plt.subplots(2, 2, figsize=(12, 10),
+                                 layout=None if output_path else 'constrained')
         
         # Cover image
-        axes[0, 0].imshow(cover, cmap='gray')
+        axes[0, 0].imshow(cover.image, cmap='gray', interpolation='nearest')
         axes[0, 0].set_title('Cover Image')
         axes[0, 0].axis('off')
         
         # Stego image
-        axes[0, 1].imshow(stego, cmap='gray')
+        axes[0, 1].imshow(stego.image, cmap='gray', interpolation='nearest')
         axes[0, 1].set_title('Stego Image')
         axes[0, 1].axis('off')
         
         # Cover histogram
-        axes[1, 0].hist(cover.flatten(), bins=256, range=(0, 256), color='blue', alpha=0.7)
+        axes[1, 0].bar(bins, cover.hist, width=1.0, align='edge', color='blue', alpha=0.7)
         axes[1, 0].set_title('Cover Histogram')
         axes[1, 0].set_xlabel('Pixel Value')
         axes[1, 0].set_ylabel('Frequency')
         
         # Stego histogram
-        axes[1, 1].hist(stego.flatten(), bins=256, range=(0, 256), color='red', alpha=0.7)
+        axes[1, 1].bar(bins, stego.hist, width=1.0, align='edge', color='red', alpha=0.7)
         axes[1, 1].set_title('Stego Histogram')
         axes[1, 1].set_xlabel('Pixel Value')
         axes[1, 1].set_ylabel('Frequency')
         
-        plt.tight_layout()
-        
         if output_path:
-            plt.savefig(output_path)
+            fig.savefig(output_path, bbox_inches='tight')
             print(f"[*] Histogram visualization saved to: {output_path}")
         else:
             plt.show()
@@ -246,44 +468,45 @@ class ChiSquareAttack:
     in pairs of values (PoVs).
     """
     
-    def analyze(self, image_path: str, sample_size: int = None) -> Dict:
+    def analyze(self, image: Union[str, np.ndarray], sample_size: int = None,
+                decode_scale: int = 1) -> Dict:
         """
         Perform Chi-Square attack
         
         Args:
-            image_path: Path to test image
+            image: Path to test image, or the image already decoded
+                (grayscale or BGR array, or the stats from _load_stats)
             sample_size: Number of pixels to analyze (None = all)
+            decode_scale: Decode at 1/decode_scale resolution (1, 2, 4, 8);
+                fewer pixels also lowers the statistic against the fixed
+                critical value
         """
-        image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-        if image is None:
-            raise ValueError(f"Cannot load image: {image_path}")
-        
-        pixels = image.flatten()
+        stats = _coerce_stats(image, decode_scale)
         
+        # Count frequency of each pixel value (the cached full-image
+        # histogram unless only a prefix is sampled)
         if sample_size:
-            pixels = pixels[:sample_size]
-        
-        # Count frequency of each pixel value
-        freq = np.bincount(pixels, minlength=256)
+            freq = _calc_hist256(stats.image.ravel()[:sample_size])
+        else:
+            freq = stats.hist
         
         # Chi-square test on pairs of values (PoVs)
         # PoVs are pairs (2i, 2i+1) which should have similar frequencies
         # if no data is embedded
         
-        chi_square = 0
-        pairs_tested = 0
-        
-        for i in range(0, 128):  # 128 pairs: (0,1), (2,3), ..., (254,255)
-            n_2i = freq[2*i]
-            n_2i_plus_1 = freq[2*i + 1]
-            
-            # Expected frequency if data embedded
-            expected = (n_2i + n_2i_plus_1) / 2.0
-            
-            if expected > 0:
-                chi_square += ((n_2i - expected) ** 2) / expected
-                chi_square += ((n_2i_plus_1 - expected) ** 2) / expected
-                pairs_tested += 1
+        # 128 pairs: (0,1), (2,3), ..., (254,255)
+        n_2i = freq[0::2].astype(np.float64)
+        n_2i_plus_1 = freq[1::2].astype(np.float64)
+        
+        # Expected frequency if data embedded; only pairs that occur are tested
+        expected = (n_2i + n_2i_plus_1) / 2.0
+        tested = expected > 0
+        n_2i, expected = n_2i[tested], expected[tested]
+        
+        # (n_2i - expected)^2 == (n_2i_plus_1 - expected)^2, so each pair
+        # contributes twice the first term
+        chi_square = float(np.sum(2.0 * (n_2i - expected) ** 2 / expected))
+        pairs_tested = int(np.count_nonzero(tested))
         
         # Critical value for chi-square distribution (95% confidence, df=127)
         # If chi_square > critical value, reject null hypothesis (no embedding)
@@ -313,12 +536,35 @@ def comprehensive_steganalysis(cover_path: str, stego_path: str) -> Dict:
     
     results = {}
     
+    rs = RSAnalysis()
+    hist = HistogramAnalysis()
+    chi_attack = ChiSquareAttack()
+    
+    # Decode and bin each image exactly once, and hand the resulting
+    # (image, hist) stats to every attack (concurrent attacks on the same path
+    # could each miss the decode cache). An unreadable path is passed on as
+    # is so the attacks report it
+    cover = _load_stats(cover_path)
+    stego = _load_stats(stego_path)
+    cover = cover_path if cover is None else cover
+    stego = stego_path if stego is None else stego
+    
+    # The attacks are independent: the histogram and chi-square attacks run in
+    # worker threads (image decoding and NumPy release the GIL) while RS runs
+    # here. RS stays on the calling thread because its Numba kernel already
+    # uses every core, and Numba's TBB layer can hang at exit when parallel
+    # kernels are launched from other threads
+    executor = ThreadPoolExecutor(max_workers=3)
+    hist_job = executor.submit(hist.analyze, cover, stego)
+    chi_cover_job = executor.submit(chi_attack.analyze, cover)
+    chi_stego_job = executor.submit(chi_attack.analyze, stego)
+    executor.shutdown(wait=False)
+    
     # 1. RS Analysis
     print("\n[*] Running RS Analysis...")
-    rs = RSAnalysis()
     try:
-        rs_cover = rs.analyze(cover_path)
-        rs_stego = rs.analyze(stego_path)
+        rs_cover = rs.analyze(cover)
+        rs_stego = rs.analyze(stego)
         results['RS_Analysis'] = {
             'cover': rs_cover,
             'stego': rs_stego
@@ -331,9 +577,8 @@ def comprehensive_steganalysis(cover_path: str, stego_path: str) -> Dict:
     
     # 2. Histogram Analysis
     print("\n[*] Running Histogram Analysis...")
-    hist = HistogramAnalysis()
     try:
-        hist_results = hist.analyze(cover_path, stego_path)
+        hist_results = hist_job.result()
         results['Histogram_Analysis'] = hist_results
         print(f"    Chi-Square Distance: {hist_results['chi_square']:.6f}")
         print(f"    KS Statistic: {hist_results['ks_statistic']:.6f}")
@@ -343,10 +588,9 @@ def comprehensive_steganalysis(cover_path: str, stego_path: str) -> Dict:
     
     # 3. Chi-Square Attack
     print("\n[*] Running Chi-Square Attack...")
-    chi_attack = ChiSquareAttack()
     try:
-        chi_cover = chi_attack.analyze(cover_path)
-        chi_stego = chi_attack.analyze(stego_path)
+        chi_cover = chi_cover_job.result()
+        chi_stego = chi_stego_job.result()
         results['ChiSquare_Attack'] = {
             'cover': chi_cover,
             'stego': chi_stego
@@ -1,8 +1,28 @@
 import sys
 import os
+import numpy as np
 from PIL import Image
 from AESCTR import aes_gcm_encrypt_with_password, aes_gcm_decrypt_with_password
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; decode then packs bits with NumPy
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _extract_chars(flat, out):
+        """Assemble byte i from the LSBs of flat[9i:9i+8] (MSB first) into out[i]"""
+        for i in prange(out.shape[0]):
+            base = 9 * i
+            code = 0
+            for k in range(8):
+                code = (code << 1) | (flat[base + k] & 1)
+            out[i] = code
+else:
+    _extract_chars = None
+
 class SteganographyLSB:
     def __init__(self):
         self.PIXELS_PER_CHAR = 3
@@ -24,18 +44,18 @@ class SteganographyLSB:
         except Exception as e:
             return "[!] Error: Incorrect Key or Corrupted Data"
 
-    def _int_to_bin(self, rgb):
-        r, g, b = rgb
-        return (f'{r:08b}', f'{g:08b}', f'{b:08b}')
-
-    def _bin_to_int(self, rgb):
-        r, g, b = rgb
-        return (int(r, 2), int(g, 2), int(b, 2))
+    def encode(self, image_path, output_path, secret_text, password):
+        print("[*] Encrypting text...")
+        cipher_text = self.encrypt_message(secret_text, password)
+        print(f"[*] Ciphertext length: {len(cipher_text)} chars")
 
-    def _merge_rgb(self, rgb1, rgb2, rgb3):
-        return list(rgb1) + list(rgb2) + list(rgb3)
+        self.encode_bytes(image_path, output_path, cipher_text.encode('latin-1'))
 
-    def encode(self, image_path, output_path, secret_text, password):
+    def encode_bytes(self, image_path, output_path, secret_bytes):
+        """
+        Embeds raw bytes (one byte per 3 pixels) without further encryption
+        or text encoding - caller is responsible for encrypting them
+        """
         print(f"[*] Loading image: {image_path}")
         image = Image.open(image_path)
         
@@ -43,54 +63,34 @@ class SteganographyLSB:
             image = image.convert('RGB')
             
         width, height = image.size
-        pixels = image.load()
-
-        print("[*] Encrypting text...")
-        cipher_text = self.encrypt_message(secret_text, password)
-        print(f"[*] Ciphertext length: {len(cipher_text)} chars")
 
         total_pixels = width * height
-        required_pixels = len(cipher_text) * self.PIXELS_PER_CHAR
+        total_chars = len(secret_bytes)
+        required_pixels = total_chars * self.PIXELS_PER_CHAR
         
+        if total_chars == 0:
+            raise ValueError("[-] Nothing to embed.")
         if required_pixels > total_pixels:
             raise ValueError(f"[-] Image too small. Need {required_pixels} pixels, have {total_pixels}.")
-
-        idx = 0
-        total_chars = len(cipher_text)
         
-        for i in range(0, total_chars):
-            char = cipher_text[i]
-            binary_char = f'{ord(char):08b}'
-            
-            coord_sets = []
-            for _ in range(3):
-                x = idx % width
-                y = idx // width
-                coord_sets.append((x, y))
-                idx += 1
-                
-            p1 = pixels[coord_sets[0]]
-            p2 = pixels[coord_sets[1]]
-            p3 = pixels[coord_sets[2]]
-            
-            nine_vals = list(p1) + list(p2) + list(p3)
-            
-            for bit_index in range(8):
-                current_val = nine_vals[bit_index]
-                bin_val = list(f'{current_val:08b}')
-                bin_val[-1] = binary_char[bit_index]
-                nine_vals[bit_index] = int("".join(bin_val), 2)
-            
-            has_more = 1 if i < (total_chars - 1) else 0
-            
-            last_val = nine_vals[8]
-            bin_last = list(f'{last_val:08b}')
-            bin_last[-1] = str(has_more)
-            nine_vals[8] = int("".join(bin_last), 2)
-            
-            pixels[coord_sets[0]] = tuple(nine_vals[0:3])
-            pixels[coord_sets[1]] = tuple(nine_vals[3:6])
-            pixels[coord_sets[2]] = tuple(nine_vals[6:9])
+        # Each byte owns 3 consecutive pixels = 9 channel values (row-major RGB):
+        # values 0..7 carry the byte bits (MSB first), value 8 the has_more flag
+        # One bulk copy of the pixel data into a writable buffer
+        buf = bytearray(image.tobytes())
+        flat = np.frombuffer(buf, dtype=np.uint8)
+        groups = flat[:total_chars * 9].reshape(total_chars, 9)
+        
+        char_codes = np.frombuffer(secret_bytes, dtype=np.uint8)
+        bits = np.unpackbits(char_codes).reshape(total_chars, 8)
+        groups[:, :8] = (groups[:, :8] & 0xFE) | bits
+        
+        has_more = np.ones(total_chars, dtype=np.uint8)
+        has_more[-1] = 0
+        groups[:, 8] = (groups[:, 8] & 0xFE) | has_more
+        
+        # Load the buffer back into the same image so its metadata
+        # (e.g. ICC profile) is saved along with the pixels
+        image.frombytes(buf)
 
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
@@ -101,52 +101,52 @@ class SteganographyLSB:
         image.save(output_path)
 
     def decode(self, image_path, password):
+        # The base64 ciphertext is handed over as the extracted bytes;
+        # b64decode takes bytes, so no str round trip is needed
+        cipher_text = self.decode_bytes(image_path)
+        
+        print("[*] Decrypting...")
+        plain_text = self.decrypt_message(cipher_text, password)
+        return plain_text
+
+    def decode_bytes(self, image_path):
+        """
+        Extracts the raw bytes embedded by encode_bytes (no decryption)
+        """
         print(f"[*] Scanning image: {image_path}")
         image = Image.open(image_path)
-        pixels = image.load()
-        width, height = image.size
         
-        extracted_bits = ""
-        cipher_text = ""
-        idx = 0
-        total_pixels = width * height
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
         
-        while idx < total_pixels:
-            if idx + 3 > total_pixels:
-                break
-                
-            coord_sets = []
-            for _ in range(3):
-                x = idx % width
-                y = idx // width
-                coord_sets.append((x, y))
-                idx += 1
-                
-            p1 = pixels[coord_sets[0]]
-            p2 = pixels[coord_sets[1]]
-            p3 = pixels[coord_sets[2]]
-            
-            nine_vals = list(p1) + list(p2) + list(p3)
-            
-            char_bits = ""
-            for i in range(8):
-                val = nine_vals[i]
-                char_bits += f'{val:08b}'[-1]
-            
-            char_code = int(char_bits, 2)
-            cipher_text += chr(char_code)
-            
-            flag_val = nine_vals[8]
-            flag_bit = f'{flag_val:08b}'[-1]
-            
-            if flag_bit == '0':
+        flat = np.frombuffer(image.tobytes(), dtype=np.uint8)
+        
+        total_groups = flat.size // 9
+        flags = flat[8:total_groups * 9:9]
+        
+        # First cleared has_more flag terminates the message; with no
+        # terminator the whole image is read, as before. Flags are scanned in
+        # doubling chunks so a short message does not cost a full-image pass
+        num_chars = total_groups
+        start, chunk = 0, 4096
+        while start < total_groups:
+            lsb = flags[start:start + chunk] & 1
+            end = int(np.argmin(lsb))
+            if lsb[end] == 0:
+                num_chars = start + end + 1
                 break
+            start, chunk = start + chunk, chunk * 2
         
-        print(f"[*] Extraction complete. Ciphertext length: {len(cipher_text)}")
+        if _extract_chars is not None:
+            chars = np.empty(num_chars, dtype=np.uint8)
+            _extract_chars(flat, chars)
+        else:
+            groups = flat[:num_chars * 9].reshape(num_chars, 9)
+            chars = np.packbits(groups[:, :8] & 1, axis=1)
+        data = chars.tobytes()
         
-        print("[*] Decrypting...")
-        plain_text = self.decrypt_message(cipher_text, password)
-        return plain_text
+        print(f"[*] Extraction complete. Ciphertext length: {len(data)}")
+        return data
 
 
 if __name__ == "__main__":